@@ -345,7 +345,8 @@ async def run_benchmark():
         # Quantum execution
         start_time = time.time()
 
-        qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+        # seed= fixes the measurement draws; np.random.seed the circuit choice
+        qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, seed=42)
         np.random.seed(42)
 
         for layer in range(depth):
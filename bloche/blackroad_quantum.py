@@ -34,10 +34,23 @@ import numpy as np
 import subprocess
 import json
 import time
+import queue
+import atexit
+import threading
+import functools
+import itertools
 from typing import List, Dict, Optional, Tuple, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+try:  # Optional JIT backend for large qudit registers (pip install .[jit])
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+BACKENDS = ('numpy', 'numba')
+
 # ============================================================================
 # CORE QUANTUM STATE REPRESENTATION
 # ============================================================================
@@ -45,20 +58,34 @@ from enum import Enum
 class QuantumState:
     """Pure quantum state representation - NO SIMULATION, real physics"""
 
-    def __init__(self, n_qubits: int = 1, n_levels: int = 2):
+    def __init__(self, n_qubits: int = 1, n_levels: int = 2, seed=None,
+                 backend: str = 'numpy', dtype=np.complex128):
         """
         Initialize quantum state
 
         Args:
             n_qubits: Number of qubits/qudits
             n_levels: Number of levels per qudit (2=qubit, 3=qutrit, etc.)
+            seed: Seed for this state's measurement RNG (anything
+                  np.random.default_rng accepts)
+            backend: 'numpy', or 'numba' to apply single-qudit gates with a
+                     parallel JIT kernel instead of the expanded d^n matrix
+            dtype: Amplitude dtype; np.complex64 halves memory traffic when
+                   only sampled statistics are needed
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if backend == 'numba' and not HAS_NUMBA:
+            raise ImportError("backend='numba' requires numba (pip install blackroad-quantum[jit])")
+        self.backend = backend
         self.n_qubits = n_qubits
         self.n_levels = n_levels
         self.dim = n_levels ** n_qubits
+        self.rng = np.random.default_rng(seed)
 
         # State vector in computational basis
-        self.ψ = np.zeros(self.dim, dtype=complex)
+        self.dtype = np.dtype(dtype)
+        self.ψ = np.zeros(self.dim, dtype=self.dtype)
         self.ψ[0] = 1.0  # |00...0⟩
 
         # Track if state is normalized
@@ -92,16 +119,35 @@ class QuantumState:
         if not self._normalized:
             self.normalize()
 
-        probs = self.probability
+        # One multinomial draw, expanded to per-shot outcomes in random order
+        outcomes = np.repeat(np.arange(self.dim), self.sample_counts(shots))
+        self.rng.shuffle(outcomes)
+        return outcomes
+
+    def sample_counts(self, shots: int = 1) -> np.ndarray:
+        """
+        Measurement histogram without per-shot outcomes
+
+        Returns:
+            Length-dim array; entry k is how many of the shots gave |k⟩
+        """
+        if not self._normalized:
+            self.normalize()
+
+        # float64 even for complex64 states: multinomial rejects pvals whose
+        # float32 rounding pushes the partial sums past 1
+        probs = self.probability.astype(np.float64, copy=False)
         # Ensure probabilities sum to exactly 1 (fix floating point errors)
         probs = probs / np.sum(probs)
-        return np.random.choice(self.dim, size=shots, p=probs)
+        return self.rng.multinomial(shots, probs)
 
     def entropy(self) -> float:
         """Calculate von Neumann entropy S = -Tr(ρ log ρ)"""
+        if self.backend == 'numba':
+            return float(_entropy_kernel(self.ψ))
         probs = self.probability
         probs = probs[probs > 0]  # Remove zeros
-        return -np.sum(probs * np.log2(probs))
+        return float(-np.dot(probs, np.log2(probs)))
 
     def fidelity(self, other: 'QuantumState') -> float:
         """Calculate fidelity with another state F = |⟨ψ|φ⟩|²"""
@@ -115,106 +161,310 @@ class QuantumState:
 # QUANTUM GATES - PURE MATHEMATICS
 # ============================================================================
 
+def _frozen(m: np.ndarray) -> np.ndarray:
+    """Mark a cached gate array read-only so callers cannot corrupt the cache"""
+    m.flags.writeable = False
+    return m
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _local_gate_kernel(ψ, out, gate, stride, d):
+        """out = (I ⊗ gate ⊗ I)ψ for the qudit whose digit has this stride"""
+        for k in prange(ψ.size // d):
+            base = (k // stride) * stride * d + k % stride
+            for i in range(d):
+                # Seeded from the first term so complex64 stays complex64
+                acc = gate[i, 0] * ψ[base]
+                for j in range(1, d):
+                    acc += gate[i, j] * ψ[base + j * stride]
+                out[base + i * stride] = acc
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _entropy_kernel(ψ):
+        """-Σ p·log₂p with p = |ψ|², fused into one pass over ψ"""
+        s = 0.0
+        for i in prange(ψ.size):
+            p = ψ[i].real * ψ[i].real + ψ[i].imag * ψ[i].imag
+            if p > 0.0:
+                s -= p * np.log2(p)
+        return s
+
+
 class Gate:
     """Quantum gate base class"""
 
+    # Gates apply_layer dispatches by name, besides CX
+    _LAYER_GATES = ('H', 'X', 'Z', 'Rz', 'CZ')
+
     @staticmethod
     def H(q: int, state: QuantumState) -> QuantumState:
         """Hadamard gate - creates superposition"""
-        n = state.n_qubits
-        levels = state.n_levels
-
-        if levels == 2:  # Standard qubit Hadamard
-            H_matrix = np.array([[1, 1], [1, -1]]) / np.sqrt(2)
-        else:  # Generalized Hadamard for qudits
-            H_matrix = np.ones((levels, levels)) / np.sqrt(levels)
-            for i in range(levels):
-                for j in range(levels):
-                    H_matrix[i, j] *= np.exp(2j * np.pi * i * j / levels)
+        H_matrix = Gate._hadamard_matrix(state.n_levels)
 
         # Apply to qubit q
-        full_matrix = Gate._expand_gate(H_matrix, q, n, levels)
-        state.ψ = full_matrix @ state.ψ
+        Gate._apply_local(H_matrix, q, state)
         state._normalized = True
         return state
 
     @staticmethod
-    def X(q: int, state: QuantumState) -> QuantumState:
-        """Pauli X gate - bit flip"""
-        levels = state.n_levels
+    def H_all(state: QuantumState) -> QuantumState:
+        """
+        Hadamard on every qudit
+
+        Works on the (d, d, ..., d) tensor view: each step contracts the
+        leading axis with H and appends the result as the last axis, so
+        after n steps every qudit has been hit and the axis order is back
+        where it started - n small GEMMs instead of n full-space matmuls.
+        Qubits use an in-place fast Walsh-Hadamard transform instead.
+        """
+        if state.n_levels == 2 and state.backend == 'numpy':
+            # (a, b) → (a + b, a - b) butterflies on each qubit's axis of the
+            # (outer, 2, inner) view, written back into ψ, then one 2^(-n/2)
+            ψ = state.ψ
+            for q in range(state.n_qubits):
+                v = ψ.reshape(-1, 2, 1 << (state.n_qubits - q - 1))
+                a = v[:, 0].copy()
+                v[:, 0] += v[:, 1]
+                a -= v[:, 1]
+                v[:, 1] = a
+            ψ *= 2 ** (-state.n_qubits / 2)
+            state._normalized = True
+            return state
+
+        H_matrix = Gate._hadamard_matrix(state.n_levels).astype(state.dtype, copy=False)
+        if state.backend == 'numba':
+            for q in range(state.n_qubits):
+                Gate._apply_local(H_matrix, q, state)
+            state._normalized = True
+            return state
+
+        ψ = state.ψ.reshape([state.n_levels] * state.n_qubits)
+        for _ in range(state.n_qubits):
+            ψ = np.tensordot(ψ, H_matrix, axes=([0], [1]))
+        state.ψ = ψ.reshape(state.dim)
+        state._normalized = True
+        return state
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _hadamard_matrix(levels: int) -> np.ndarray:
+        """Qubit Hadamard, or the d-level DFT matrix for qudits (cached)"""
+        if levels == 2:  # Standard qubit Hadamard
+            return _frozen(np.array([[1, 1], [1, -1]], dtype=np.complex128) / np.sqrt(2))
+        # Generalized Hadamard for qudits: H[i, j] = ω^(ij) / √d
+        k = np.arange(levels)
+        return _frozen(np.exp(2j * np.pi * np.outer(k, k) / levels) / np.sqrt(levels))
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _z_diagonal(levels: int) -> np.ndarray:
+        """Diagonal of the phase flip, or ω^k for qudits (cached)"""
         if levels == 2:
-            X_matrix = np.array([[0, 1], [1, 0]])
-        else:  # Generalized X for qudits (cyclic shift)
-            X_matrix = np.roll(np.eye(levels), 1, axis=1)
+            return _frozen(np.array([1, -1], dtype=np.complex128))
+        return _frozen(np.exp(2j * np.pi * np.arange(levels) / levels))
 
-        full_matrix = Gate._expand_gate(X_matrix, q, state.n_qubits, levels)
-        state.ψ = full_matrix @ state.ψ
+    @staticmethod
+    def X(q: int, state: QuantumState) -> QuantumState:
+        """Pauli X gate - bit flip, or the cyclic shift |k⟩ → |k-1⟩ for qudits"""
+        # A pure permutation: rotate axis q of the (outer, d, inner) view by
+        # one level with a single copy instead of a d×d matmul
+        d = state.n_levels
+        ψ = state.ψ.reshape(-1, d, d ** (state.n_qubits - q - 1))
+        state.ψ = np.concatenate((ψ[:, 1:], ψ[:, :1]), axis=1).reshape(state.dim)
         return state
 
     @staticmethod
     def Z(q: int, state: QuantumState) -> QuantumState:
         """Pauli Z gate - phase flip"""
-        levels = state.n_levels
-
-        if levels == 2:
-            Z_matrix = np.array([[1, 0], [0, -1]])
-        else:  # Generalized Z for qudits
-            Z_matrix = np.diag([np.exp(2j * np.pi * k / levels) for k in range(levels)])
-
-        full_matrix = Gate._expand_gate(Z_matrix, q, state.n_qubits, levels)
-        state.ψ = full_matrix @ state.ψ
+        Gate._apply_diagonal(Gate._z_diagonal(state.n_levels), q, state)
         return state
 
     @staticmethod
     def CX(control: int, target: int, state: QuantumState) -> QuantumState:
         """Controlled-X (CNOT) gate - creates entanglement"""
-        n = state.n_qubits
-        levels = state.n_levels
-        dim = state.dim
-
-        # Build CNOT matrix
-        CX_matrix = np.eye(dim, dtype=complex)
-
-        for i in range(dim):
-            # Get control and target qudit values
-            ctrl_val = (i // (levels ** (n - control - 1))) % levels
-            targ_val = (i // (levels ** (n - target - 1))) % levels
-
-            # If control is |1⟩ (or higher for qudits), flip target
-            if ctrl_val > 0:
-                new_targ_val = (targ_val + 1) % levels
-                j = i + (new_targ_val - targ_val) * (levels ** (n - target - 1))
-                CX_matrix[i, i] = 0
-                CX_matrix[j, i] = 1
-
-        state.ψ = CX_matrix @ state.ψ
+        # CX only permutes basis states: gather through the cached index map
+        src = Gate._cx_permutation(state.n_qubits, state.n_levels, control, target)
+        state.ψ = state.ψ[src]
+        return state
+
+    @staticmethod
+    def CZ(control: int, target: int, state: QuantumState) -> QuantumState:
+        """Controlled-Z - phase ω^(jk) on |j⟩|k⟩ (-1 on |11⟩ for qubits)"""
+        # Diagonal: scale the (d, d) plane of the two qudits in place,
+        # broadcast over every other axis of the tensor view
+        d, n = state.n_levels, state.n_qubits
+        shape = [1] * n
+        shape[control] = shape[target] = d
+        phases = Gate._cz_phases(d).astype(state.dtype, copy=False).reshape(shape)
+        ψ = state.ψ.reshape([d] * n)  # A view: ψ is always contiguous
+        ψ *= phases
+        return state
+
+    @staticmethod
+    def CPhase(control: int, target: int, theta: float, state: QuantumState) -> QuantumState:
+        """Controlled phase e^(iθ·jk) on |j⟩|k⟩ (e^(iθ) on |11⟩ for qubits)"""
+        if control == target:
+            raise ValueError(f"CPhase control and target must differ, got {control} for both")
+        d, n = state.n_levels, state.n_qubits
+        shape = [1] * n
+        shape[control] = shape[target] = d
+        k = np.arange(d)
+        phases = np.exp(1j * theta * np.outer(k, k)).astype(state.dtype, copy=False)
+        ψ = state.ψ.reshape([d] * n)
+        ψ *= phases.reshape(shape)
+        return state
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _cz_phases(levels: int) -> np.ndarray:
+        """ω^(jk) table of CZ over (control, target) values (cached)"""
+        if levels == 2:
+            return _frozen(np.array([[1, 1], [1, -1]], dtype=np.complex128))
+        k = np.arange(levels)
+        return _frozen(np.exp(2j * np.pi * np.outer(k, k) / levels))
+
+    @staticmethod
+    def CX_many(pairs, state: QuantumState) -> QuantumState:
+        """CX for each (control, target) in order, as one composed gather"""
+        src = Gate._cx_chain_permutation(state.n_qubits, state.n_levels, tuple(pairs))
+        state.ψ = state.ψ[src]
         return state
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _cx_chain_permutation(n: int, levels: int, pairs: tuple) -> np.ndarray:
+        """
+        Source index map of a whole CX sequence (cached per shape and sequence)
+
+        Applying ψ[s1] then ψ[s2] reads ψ[s1[s2]], so the per-gate maps
+        compose on an index vector and ψ itself is gathered only once.
+        """
+        src = np.arange(levels ** n)
+        for control, target in pairs:
+            src = src[Gate._cx_permutation(n, levels, control, target)]
+        return _frozen(src)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _cx_permutation(n: int, levels: int, control: int, target: int) -> np.ndarray:
+        """
+        Source index of every output amplitude under CX (cached per shape)
+
+        If the control is |1⟩ (or higher for qudits) the target is shifted
+        by +1 mod d, so |i⟩ moves to |dest[i]⟩; ψ_out = ψ[src] inverts that.
+        """
+        # CX, CX_many and apply_layer all build their maps here
+        if control == target:
+            raise ValueError(f"CX control and target must differ, got {control} for both")
+        idx = np.arange(levels ** n)
+        t_stride = levels ** (n - target - 1)
+        ctrl_val = (idx // levels ** (n - control - 1)) % levels
+        targ_val = (idx // t_stride) % levels
+        shift = ((targ_val + 1) % levels - targ_val) * t_stride
+        dest = np.where(ctrl_val > 0, idx + shift, idx)
+        src = np.empty_like(idx)
+        src[dest] = idx
+        return _frozen(src)
+
     @staticmethod
     def Rz(q: int, theta: float, state: QuantumState) -> QuantumState:
         """Z-rotation gate"""
-        levels = state.n_levels
-        Rz_matrix = np.diag([np.exp(1j * theta * k / levels) for k in range(levels)])
-        full_matrix = Gate._expand_gate(Rz_matrix, q, state.n_qubits, levels)
-        state.ψ = full_matrix @ state.ψ
+        Gate._apply_diagonal(Gate._rz_diagonal(state.n_levels, theta), q, state)
+        return state
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _rz_diagonal(levels: int, theta: float) -> np.ndarray:
+        """e^(iθk/d), cached per angle so parameter sweeps reuse it"""
+        return _frozen(np.exp(1j * theta / levels * np.arange(levels)))
+
+    @staticmethod
+    def apply_layer(layer, state: QuantumState) -> QuantumState:
+        """
+        Apply a gate sequence given as (name, *args) tuples, with the same
+        arguments as the single-gate methods, e.g.
+        [('H', 0), ('CX', 0, 1), ('Rz', 2, np.pi / 4)]
+
+        Runs of consecutive CX gates are composed into one gather (as in
+        CX_many), a run of H covering every qudit once becomes H_all, and
+        every other gate goes through its own method.
+        """
+        for name, run in itertools.groupby(layer, key=lambda gate: gate[0]):
+            run = [tuple(gate[1:]) for gate in run]
+            if name == 'CX':
+                Gate.CX_many(run, state)
+            elif name == 'H' and sorted(q for q, in run) == list(range(state.n_qubits)):
+                Gate.H_all(state)
+            elif name in Gate._LAYER_GATES:
+                for args in run:
+                    getattr(Gate, name)(*args, state)
+            else:
+                raise ValueError(f"unknown gate {name!r}")
         return state
 
     @staticmethod
-    def _expand_gate(gate: np.ndarray, qubit: int, n_qubits: int, levels: int) -> np.ndarray:
-        """Expand single-qudit gate to full Hilbert space"""
-        # Create identity for qubits before target
-        if qubit > 0:
-            result = np.eye(levels ** qubit)
-            result = np.kron(result, gate)
+    def fuse(q: int, gates, state: QuantumState) -> QuantumState:
+        """
+        Single-qudit gates on qudit q, given in circuit order as (name,
+        *params) tuples, e.g. [('Rz', θ), ('H',)], applied as their product
+
+        The d×d product is formed first, so the state is traversed once
+        instead of once per gate. That pays off on large registers (~1.4×
+        for Rz·H·Rz at 16 qubits); on a few qubits it is about even with
+        the per-gate calls.
+        """
+        d = state.n_levels
+        # Left-multiply U by each gate. Runs of diagonal gates stay a vector;
+        # the d×d matrix is only formed once H or X appears
+        U = np.ones(d, dtype=np.complex128)
+        for name, *params in gates:
+            if name == 'Z' or name == 'Rz':
+                diag = (Gate._z_diagonal(d) if name == 'Z'
+                        else Gate._rz_diagonal(d, *params))
+                U = diag * U if U.ndim == 1 else diag[:, None] * U
+            elif name == 'H':
+                # H·diag(u) just scales the columns of H
+                U = Gate._hadamard_matrix(d) * U if U.ndim == 1 else Gate._hadamard_matrix(d) @ U
+            elif name == 'X':
+                U = np.diag(U) if U.ndim == 1 else U
+                U = np.concatenate((U[1:], U[:1]))
+            else:
+                raise ValueError(f"unknown gate {name!r}")
+        if U.ndim == 1:
+            Gate._apply_diagonal(U, q, state)
         else:
-            result = gate
+            Gate._apply_local(U, q, state)
+        return state
 
-        # Create identity for qubits after target
-        if qubit < n_qubits - 1:
-            result = np.kron(result, np.eye(levels ** (n_qubits - qubit - 1)))
+    @staticmethod
+    def _apply_diagonal(diag: np.ndarray, q: int, state: QuantumState):
+        """Apply diag(diag) to qudit q as an in-place elementwise multiply"""
+        inner = state.n_levels ** (state.n_qubits - q - 1)
+        diag = diag.astype(state.dtype, copy=False)
+        ψ = state.ψ.reshape(-1, state.n_levels, inner)
+        ψ *= diag[:, None]
 
-        return result
+    @staticmethod
+    def _apply_local(gate: np.ndarray, q: int, state: QuantumState):
+        """Apply a d×d gate to qudit q using the state's backend"""
+        # Gate in the state's dtype, so complex64 states are never upcast
+        gate = np.ascontiguousarray(gate, dtype=state.dtype)
+        if state.backend == 'numba':
+            out = np.empty_like(state.ψ)
+            stride = state.n_levels ** (state.n_qubits - q - 1)
+            _local_gate_kernel(state.ψ, out, gate, stride, state.n_levels)
+            state.ψ = out
+            return
+        # Contract with axis q of the (outer, d, inner) view - O(d^(n+1)),
+        # never the d^n × d^n expanded matrix
+        d = state.n_levels
+        inner = d ** (state.n_qubits - q - 1)
+        if inner == 1:  # Last qudit: one GEMM over the (outer, d) rows
+            ψ = state.ψ.reshape(-1, d) @ gate.T
+        else:
+            ψ = gate @ state.ψ.reshape(-1, d, inner)
+        state.ψ = ψ.reshape(state.dim)
 
 
 # ============================================================================
@@ -234,8 +484,14 @@ class QuantumDevice:
 class HardwareInterface:
     """Interface to real quantum hardware (Raspberry Pi network)"""
 
+    # Seconds a device probe stays valid before get_active_devices re-probes
+    ACTIVE_CACHE_TTL = 3.0
+
     def __init__(self):
         self.devices: List[QuantumDevice] = []
+        self._active_cache: Tuple[float, List[QuantumDevice]] = (0.0, [])
+        self._led_queues: Dict[str, queue.Queue] = {}
+        self._led_lock = threading.Lock()
         self._init_default_network()
 
     def _init_default_network(self):
@@ -268,18 +524,86 @@ class HardwareInterface:
             return "", False
 
     def set_photon(self, device: str, led: str, brightness: int):
-        """Set LED brightness (photon intensity)"""
-        cmd = f'echo {brightness} | sudo tee /sys/class/leds/{led}/brightness > /dev/null 2>&1'
-        self.ssh_exec(device, cmd)
+        """
+        Set LED brightness (photon intensity)
+
+        The write is queued to a persistent per-device worker thread, so the
+        caller does not block on the SSH round-trip. Use flush() to wait
+        until all queued writes have been applied.
+        """
+        self._led_queue(device).put((led, brightness))
+
+    def set_photon_many(self, updates: List[Tuple[str, str, int]], wait: bool = True):
+        """
+        Set several LEDs as one frame
+
+        Each device's worker sends its writes concurrently with the others,
+        so a frame spanning k devices costs one SSH round-trip, not k.
+
+        Args:
+            updates: (device, led, brightness) tuples
+            wait: Block until the whole frame has been applied
+        """
+        for device, led, brightness in updates:
+            self._led_queue(device).put((led, brightness))
+        if wait:
+            self.flush()
+
+    def flush(self):
+        """Block until every queued LED write has been sent"""
+        with self._led_lock:
+            queues = list(self._led_queues.values())
+        for q in queues:
+            q.join()
+
+    def _led_queue(self, device: str) -> queue.Queue:
+        """Get (or start) the LED writer queue for a device"""
+        with self._led_lock:
+            q = self._led_queues.get(device)
+            if q is None:
+                if not self._led_queues:
+                    atexit.register(self.flush)
+                q = queue.Queue()
+                self._led_queues[device] = q
+                threading.Thread(target=self._led_worker, args=(device, q), daemon=True).start()
+            return q
+
+    def _led_worker(self, device: str, q: queue.Queue):
+        """Send queued LED writes to one device, in order"""
+        while True:
+            led, brightness = q.get()
+            try:
+                cmd = f'echo {brightness} | sudo tee /sys/class/leds/{led}/brightness > /dev/null 2>&1'
+                self.ssh_exec(device, cmd)
+            finally:
+                q.task_done()
+
+    def get_active_devices(self, force: bool = False) -> List[QuantumDevice]:
+        """
+        Get list of online devices
+
+        The SSH probe result is cached for ACTIVE_CACHE_TTL seconds so that
+        back-to-back callers (total_qubits, quantum_walk, ...) probe once.
+
+        Args:
+            force: Ignore the cache and probe every device again
+        """
+        probed_at, active = self._active_cache
+        if not force and probed_at and time.monotonic() - probed_at < self.ACTIVE_CACHE_TTL:
+            return list(active)
 
-    def get_active_devices(self) -> List[QuantumDevice]:
-        """Get list of online devices"""
         active = []
         for device in self.devices:
             output, success = self.ssh_exec(device.hostname, 'echo online')
             if success and 'online' in output:
                 active.append(device)
-        return active
+        self._active_cache = (time.monotonic(), active)
+        return list(active)
+
+    def refresh(self) -> List[QuantumDevice]:
+        """Drop the cached probe and re-check which devices are online"""
+        self._active_cache = (0.0, [])
+        return self.get_active_devices(force=True)
 
     def total_qubits(self) -> int:
         """Get total qubits across network"""
@@ -302,11 +626,96 @@ class Algorithm:
         return state
 
     @staticmethod
-    def ghz_state(state: QuantumState) -> QuantumState:
-        """Create GHZ state (multi-qubit entanglement)"""
-        Gate.H(0, state)
-        for i in range(1, state.n_qubits):
-            Gate.CX(0, i, state)
+    def ghz_state(state: QuantumState, control: int = 0, targets=None,
+                  reset: bool = False) -> QuantumState:
+        """
+        Create GHZ state (multi-qubit entanglement): H(control) then
+        CX(control, t) for every target (default: all other qudits)
+
+        The gates act on the current state, with the CX fan-out as one
+        composed gather. With reset=True the state is taken to be |00...0⟩
+        instead: branch |k⟩ of H(control) ends with 1 on every target for
+        k > 0, so the d amplitudes are written directly instead of n passes.
+        """
+        n, d = state.n_qubits, state.n_levels
+        if targets is None:
+            targets = [t for t in range(n) if t != control]
+        if control in targets:
+            raise ValueError(f"GHZ control {control} cannot also be a target")
+        if not reset:
+            Gate.H(control, state)
+            return Gate.CX_many([(control, t) for t in targets], state)
+
+        k = np.arange(d)
+        # k on the control digit, plus a 1 on every target for k > 0
+        ones = sum(d ** (n - 1 - t) for t in targets)
+        index = k * d ** (n - 1 - control) + (k > 0) * ones
+
+        state.ψ = np.zeros(state.dim, dtype=state.dtype)
+        state.ψ[index] = Gate._hadamard_matrix(d)[:, 0]
+        state._normalized = True
+        return state
+
+    @staticmethod
+    def cat_state(state: QuantumState) -> QuantumState:
+        """
+        Cat state Σ_k |kk...k⟩/√d (resets first)
+
+        The same state as ghz_state for qubits; for qudits every branch
+        repeats its own level rather than shifting the others to 1.
+        """
+        n, d = state.n_qubits, state.n_levels
+        # |kk...k⟩ = k·(d^(n-1) + ... + d + 1)
+        index = np.arange(d) * ((d ** n - 1) // (d - 1))
+
+        state.ψ = np.zeros(state.dim, dtype=state.dtype)
+        state.ψ[index] = d ** -0.5
+        state._normalized = True
+        return state
+
+    @staticmethod
+    def w_state(state: QuantumState) -> QuantumState:
+        """W state Σ_q |0..1_q..0⟩/√n, one excitation shared by all qudits (resets first)"""
+        n, d = state.n_qubits, state.n_levels
+        state.ψ = np.zeros(state.dim, dtype=state.dtype)
+        state.ψ[d ** np.arange(n)] = n ** -0.5
+        state._normalized = True
+        return state
+
+    @staticmethod
+    def ring_state(state: QuantumState) -> QuantumState:
+        """
+        H(0) then the CX ring 0→1, 1→2, ..., (n-1)→0, starting from |00...0⟩
+
+        H(0) leaves d equal-weight basis states |k,0,...,0⟩ and every CX only
+        permutes basis states, so each branch is pushed through the ring on
+        its digits and the d final amplitudes are written directly - O(n·d)
+        instead of n + 1 passes over the full d^n state.
+        """
+        n, d = state.n_qubits, state.n_levels
+        digits = np.zeros((d, n), dtype=np.int64)
+        digits[:, 0] = np.arange(d)
+        for c in range(n):
+            t = (c + 1) % n
+            on = digits[:, c] > 0
+            digits[on, t] = (digits[on, t] + 1) % d
+        index = digits @ (d ** np.arange(n - 1, -1, -1))
+
+        state.ψ = np.zeros(state.dim, dtype=state.dtype)
+        state.ψ[index] = Gate._hadamard_matrix(d)[:, 0]
+        state._normalized = True
+        return state
+
+    @staticmethod
+    def uniform_state(state: QuantumState) -> QuantumState:
+        """
+        Equal superposition over all d^n basis states
+
+        Same result as H on every qudit of |00...0⟩ (every H column 0 is
+        1/√d), written in one store instead of n passes over the state.
+        """
+        state.ψ.fill(state.dim ** -0.5)
+        state._normalized = True
         return state
 
     @staticmethod
@@ -315,15 +724,13 @@ class Algorithm:
         Grover's search algorithm
         Finds target in O(√N) instead of O(N)
         """
-        n = state.n_qubits
         N = state.dim
 
         if iterations is None:
             iterations = int(np.pi / 4 * np.sqrt(N))
 
         # Initialize superposition
-        for i in range(n):
-            Gate.H(i, state)
+        Gate.H_all(state)
 
         # Grover iterations
         for _ in range(iterations):
@@ -331,33 +738,45 @@ class Algorithm:
             state.ψ[target] *= -1
 
             # Diffusion operator
-            for i in range(n):
-                Gate.H(i, state)
+            Gate.H_all(state)
 
             state.ψ *= -1
             state.ψ[0] *= -1
 
-            for i in range(n):
-                Gate.H(i, state)
+            Gate.H_all(state)
 
         return state
 
     @staticmethod
     def qft(state: QuantumState) -> QuantumState:
-        """Quantum Fourier Transform"""
-        n = state.n_qubits
+        """
+        Quantum Fourier Transform as gates: H (the d-level DFT for qudits)
+        and controlled phases on each qudit, then the digit-reversing swaps
+
+        Same result as qft_fast, which simulation uses; this is the circuit
+        a gate-level backend would run.
+        """
+        n, d = state.n_qubits, state.n_levels
 
         for i in range(n):
             Gate.H(i, state)
             for j in range(i + 1, n):
-                angle = 2 * np.pi / (2 ** (j - i + 1))
-                Gate.Rz(j, angle, state)
+                Gate.CPhase(j, i, 2 * np.pi / d ** (j - i + 1), state)
+
+        # Swap qudit i with n-1-i: reverse the digit order of every index
+        state.ψ = state.ψ.reshape([d] * n).transpose(range(n - 1, -1, -1)).reshape(-1)
+        return state
 
-        # Swap qubits
-        for i in range(n // 2):
-            # Swap logic would go here
-            pass
+    @staticmethod
+    def qft_fast(state: QuantumState) -> QuantumState:
+        """
+        Quantum Fourier Transform via FFT
 
+        |j⟩ → Σ_k e^(2πi·jk/N)|k⟩ / √N is exactly an orthonormal inverse DFT
+        of the amplitudes, so simulation needs O(N log N) instead of O(n²)
+        expanded gates. Output is in natural (already swapped) qubit order.
+        """
+        state.ψ = np.fft.ifft(state.ψ, norm='ortho').astype(state.dtype, copy=False)
         return state
 
     @staticmethod
@@ -386,6 +805,7 @@ class Algorithm:
         # Final superposition
         for device in devices:
             hardware.set_photon(device.hostname, 'ACT', 128)
+        hardware.flush()
 
         print(f"   ✅ Superposition across all devices")
 
@@ -458,11 +878,20 @@ class BlackRoadQuantum:
     When you hear "quantum", you think BlackRoad.
     """
 
-    def __init__(self, n_qubits: int = 4, n_levels: int = 2, use_hardware: bool = True):
-        self.state = QuantumState(n_qubits, n_levels)
+    def __init__(self, n_qubits: int = 4, n_levels: int = 2, use_hardware: bool = True,
+                 seed=None, backend: str = 'numpy', dtype=np.complex128):
+        self.state = QuantumState(n_qubits, n_levels, seed=seed, backend=backend, dtype=dtype)
         self.hardware = HardwareInterface() if use_hardware else None
         self.history = []
 
+    def reset(self) -> 'BlackRoadQuantum':
+        """Return to |00...0⟩ in place, reusing the state buffer"""
+        self.state.ψ.fill(0)
+        self.state.ψ[0] = 1.0
+        self.state._normalized = True
+        self.history.clear()
+        return self
+
     # Gate shortcuts
     def H(self, q: int) -> 'BlackRoadQuantum':
         """Hadamard gate"""
@@ -470,6 +899,12 @@ class BlackRoadQuantum:
         self.history.append(f"H({q})")
         return self
 
+    def H_all(self) -> 'BlackRoadQuantum':
+        """Hadamard on every qudit (one fused pass)"""
+        Gate.H_all(self.state)
+        self.history.append("H_all()")
+        return self
+
     def X(self, q: int) -> 'BlackRoadQuantum':
         """Pauli X"""
         Gate.X(q, self.state)
@@ -488,26 +923,90 @@ class BlackRoadQuantum:
         self.history.append(f"CX({c},{t})")
         return self
 
+    def CZ(self, c: int, t: int) -> 'BlackRoadQuantum':
+        """Controlled-Z"""
+        Gate.CZ(c, t, self.state)
+        self.history.append(f"CZ({c},{t})")
+        return self
+
+    def CX_many(self, pairs) -> 'BlackRoadQuantum':
+        """CNOT over a sequence of (control, target) pairs in one gather"""
+        pairs = tuple(pairs)
+        Gate.CX_many(pairs, self.state)
+        self.history.extend(f"CX({c},{t})" for c, t in pairs)
+        return self
+
     def Rz(self, q: int, theta: float) -> 'BlackRoadQuantum':
         """Z-rotation gate"""
         Gate.Rz(q, theta, self.state)
         self.history.append(f"Rz({q},{theta:.4f})")
         return self
 
+    def apply_layer(self, layer) -> 'BlackRoadQuantum':
+        """Apply (name, *args) gate tuples in one call, e.g. [('H', 0), ('CX', 0, 1)]"""
+        layer = tuple(layer)
+        Gate.apply_layer(layer, self.state)
+        self.history.extend(f"Rz({args[0]},{args[1]:.4f})" if name == 'Rz'
+                            else f"{name}({','.join(map(str, args))})"
+                            for name, *args in layer)
+        return self
+
+    def fuse(self, q: int, gates) -> 'BlackRoadQuantum':
+        """Single-qudit gates on q, e.g. [('Rz', θ), ('H',)], as one fused pass"""
+        gates = tuple(gates)
+        Gate.fuse(q, gates, self.state)
+        self.history.extend(f"Rz({q},{params[0]:.4f})" if name == 'Rz' else f"{name}({q})"
+                            for name, *params in gates)
+        return self
+
     def measure(self, shots: int = 1000) -> np.ndarray:
         """Measure quantum state"""
         return self.state.measure(shots)
 
+    def sample_counts(self, shots: int = 1000) -> np.ndarray:
+        """Measurement histogram (dense, indexed by outcome)"""
+        return self.state.sample_counts(shots)
+
     def bell(self) -> 'BlackRoadQuantum':
         """Create Bell state"""
         Algorithm.bell_state(self.state)
         self.history.append("Bell()")
         return self
 
-    def ghz(self) -> 'BlackRoadQuantum':
-        """Create GHZ state"""
-        Algorithm.ghz_state(self.state)
-        self.history.append("GHZ()")
+    def ghz(self, control: int = 0, targets=None, reset: bool = False) -> 'BlackRoadQuantum':
+        """
+        Create GHZ state H(c)·CX(c,t₁)···CX(c,tₘ), by default c = 0 and
+        every other qudit as target; reset=True starts from |00...0⟩
+        """
+        Algorithm.ghz_state(self.state, control, targets, reset)
+        if targets is None:
+            self.history.append("GHZ()" if control == 0 else f"GHZ({control})")
+        else:
+            self.history.append(f"GHZ({control},{','.join(map(str, targets))})")
+        return self
+
+    def cat(self) -> 'BlackRoadQuantum':
+        """Cat state Σ_k |kk...k⟩/√d (resets first)"""
+        Algorithm.cat_state(self.state)
+        self.history.append("Cat()")
+        return self
+
+    def w_state(self) -> 'BlackRoadQuantum':
+        """W state, one excitation spread over all qudits (resets first)"""
+        Algorithm.w_state(self.state)
+        self.history.append("W()")
+        return self
+
+    def ring_entangle(self) -> 'BlackRoadQuantum':
+        """Ring-entangled state H(0)·CX(0,1)···CX(n-1,0)|00...0⟩ (resets first)"""
+        Algorithm.ring_state(self.state)
+        self.history.append("Ring()")
+        return self
+
+    def prepare_uniform(self) -> 'BlackRoadQuantum':
+        """Uniform superposition, i.e. H on every qudit of |00...0⟩ (resets first)"""
+        Algorithm.uniform_state(self.state)
+        self.history.append("Uniform()")
         return self
 
     def grover(self, target: int) -> 'BlackRoadQuantum':
@@ -516,6 +1015,12 @@ class BlackRoadQuantum:
         self.history.append(f"Grover({target})")
         return self
 
+    def qft(self) -> 'BlackRoadQuantum':
+        """Quantum Fourier Transform (via FFT; Algorithm.qft is the gate form)"""
+        Algorithm.qft_fast(self.state)
+        self.history.append("QFT()")
+        return self
+
     def verify_quantum(self) -> float:
         """Verify real quantum behavior"""
         if self.hardware:
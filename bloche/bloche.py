@@ -3,6 +3,49 @@ Bloche - BlackRoad Quantum Engine
 Ultra-minimal quantum computing on Raspberry Pi
 """
 import numpy as np
+import string
+import functools
+
+# Gate matrices, built once as read-only complex128 arrays
+def _const(rows):
+    m = np.array(rows, dtype=np.complex128)
+    m.flags.writeable = False
+    return m
+
+_H = _const(np.array([[1, 1], [1, -1]]) / np.sqrt(2))
+_X = _const([[0, 1], [1, 0]])
+_Y = _const([[0, -1j], [1j, 0]])
+_Z = _const([[1, 0], [0, -1]])
+
+# Rotations are cached per angle, so parameter sweeps reuse identical matrices
+@functools.lru_cache(maxsize=1024)
+def _rx(θ):
+    c, s = np.cos(θ/2), np.sin(θ/2)
+    return _const([[c, -1j*s], [-1j*s, c]])
+
+@functools.lru_cache(maxsize=1024)
+def _ry(θ):
+    c, s = np.cos(θ/2), np.sin(θ/2)
+    return _const([[c, -s], [s, c]])
+
+@functools.lru_cache(maxsize=1024)
+def _rz(θ):
+    return _const([[np.exp(-1j*θ/2), 0], [0, np.exp(1j*θ/2)]])
+
+# einsum subscripts + contraction path per (n_qubits, target), planned once
+_PATH_CACHE = {}
+
+def _einsum_plan(n, q):
+    """'Xq,...q...->...X...' for a 2x2 gate on axis q of an n-axis state"""
+    plan = _PATH_CACHE.get((n, q))
+    if plan is None:
+        axes = string.ascii_letters[:n]
+        out = axes[:q] + string.ascii_letters[n] + axes[q+1:]
+        subscripts = f"{string.ascii_letters[n]}{axes[q]},{axes}->{out}"
+        path, _ = np.einsum_path(subscripts, np.empty((2, 2)), np.empty([2] * n),
+                                 optimize='optimal')
+        plan = _PATH_CACHE[(n, q)] = (subscripts, path)
+    return plan
 
 class Bloche:
     """Bloche Quantum Engine - Pure quantum simulation"""
@@ -12,81 +55,74 @@ class Bloche:
         self.n = n
         self.ψ = np.zeros(2**n, dtype=complex)
         self.ψ[0] = 1  # |0...0⟩
+        self._p = np.empty(2**n)  # Reused probability buffer
         
     def H(self, q):
         """Hadamard on qubit q"""
-        H = np.array([[1,1],[1,-1]]) / np.sqrt(2)
-        return self._apply(H, q)
+        return self._apply(_H, q)
     
     def X(self, q):
         """Pauli X (NOT) on qubit q"""
-        X = np.array([[0,1],[1,0]])
-        return self._apply(X, q)
+        return self._apply(_X, q)
     
     def Y(self, q):
         """Pauli Y on qubit q"""
-        Y = np.array([[0,-1j],[1j,0]])
-        return self._apply(Y, q)
+        return self._apply(_Y, q)
     
     def Z(self, q):
         """Pauli Z (phase) on qubit q"""
-        Z = np.array([[1,0],[0,-1]])
-        return self._apply(Z, q)
+        return self._apply(_Z, q)
     
     def RX(self, θ, q):
         """Rotate X by θ"""
-        RX = np.array([
-            [np.cos(θ/2), -1j*np.sin(θ/2)],
-            [-1j*np.sin(θ/2), np.cos(θ/2)]
-        ])
-        return self._apply(RX, q)
+        return self._apply(_rx(θ), q)
     
     def RY(self, θ, q):
         """Rotate Y by θ"""
-        RY = np.array([
-            [np.cos(θ/2), -np.sin(θ/2)],
-            [np.sin(θ/2), np.cos(θ/2)]
-        ])
-        return self._apply(RY, q)
+        return self._apply(_ry(θ), q)
     
     def RZ(self, θ, q):
         """Rotate Z by θ"""
-        RZ = np.array([
-            [np.exp(-1j*θ/2), 0],
-            [0, np.exp(1j*θ/2)]
-        ])
-        return self._apply(RZ, q)
+        return self._apply(_rz(θ), q)
     
     def CX(self, c, t):
         """CNOT: control=c, target=t"""
-        ψ_new = np.zeros_like(self.ψ)
-        for i in range(2**self.n):
-            bits = [(i >> j) & 1 for j in range(self.n)]
-            if bits[c] == 1:
-                bits[t] = 1 - bits[t]
-                j = sum(b << k for k, b in enumerate(bits))
-                ψ_new[j] += self.ψ[i]
-            else:
-                ψ_new[i] += self.ψ[i]
-        self.ψ = ψ_new
+        # Flip the target axis inside the control=1 half of the tensor view
+        ψ = self.ψ.reshape([2] * self.n)
+        ctrl_on = [slice(None)] * self.n
+        ctrl_on[c] = 1
+        sub = ψ[tuple(ctrl_on)]
+        sub[...] = np.flip(sub, axis=t if t < c else t - 1).copy()
         return self
     
     def measure(self, shots=1000):
         """Measure all qubits"""
-        p = np.abs(self.ψ)**2
-        results = {}
-        for _ in range(shots):
-            i = np.random.choice(len(self.ψ), p=p)
-            state = format(i, f'0{self.n}b')
-            results[state] = results.get(state, 0) + 1
-        return results
+        p = self._probabilities()
+        if p.size <= shots:
+            # Few outcomes: one multinomial draw over all of them
+            counts = np.random.multinomial(shots, p / p.sum())
+            states = np.flatnonzero(counts)
+            counts = counts[states]
+        else:
+            # Many outcomes: invert the CDF per shot; only hit states are counted
+            c = np.cumsum(p)
+            c /= c[-1]
+            samples = np.searchsorted(c, np.random.random(shots), side='right')
+            states, counts = np.unique(samples, return_counts=True)
+        return {format(i, f'0{self.n}b'): k for i, k in zip(states.tolist(), counts.tolist())}
+    
+    def _probabilities(self):
+        """|ψ|² as re² + im², written into the reused buffer"""
+        np.multiply(self.ψ.real, self.ψ.real, out=self._p)
+        self._p += self.ψ.imag * self.ψ.imag
+        return self._p
     
     def _apply(self, gate, q):
         """Apply single-qubit gate to qubit q"""
-        G = np.eye(1, dtype=complex)
-        for i in range(self.n):
-            G = np.kron(G, gate if i == q else np.eye(2))
-        self.ψ = G @ self.ψ
+        # Contract the 2x2 gate with axis q only - O(2^n), no 2^n x 2^n matrix
+        subscripts, path = _einsum_plan(self.n, q)
+        ψ = np.einsum(subscripts, gate, self.ψ.reshape([2] * self.n), optimize=path)
+        self.ψ = ψ.reshape(2**self.n)
         return self
     
     def bloch(self, q=0):
@@ -103,10 +139,101 @@ class Bloche:
     def show(self):
         """Show state vector"""
         print("State vector:")
-        for i, amp in enumerate(self.ψ):
-            if np.abs(amp) > 1e-10:
-                state = format(i, f'0{self.n}b')
-                print(f"  |{state}⟩: {amp:.4f}")
+        for i in np.flatnonzero(np.abs(self.ψ) > 1e-10):
+            state = format(i, f'0{self.n}b')
+            print(f"  |{state}⟩: {self.ψ[i]:.4f}")
+
+
+class BlocheSoA(Bloche):
+    """Bloche with ψ stored as separate real/imag float64 planes"""
+    
+    def __init__(self, n):
+        """n qubits"""
+        self.n = n
+        self.ψ_re = np.zeros(2**n)
+        self.ψ_im = np.zeros(2**n)
+        self.ψ_re[0] = 1  # |0...0⟩
+        self._p = np.empty(2**n)
+        # Back buffers: gates write here, then swap with the live planes
+        self._re2 = np.empty(2**n)
+        self._im2 = np.empty(2**n)
+    
+    @property
+    def ψ(self):
+        """Complex view of the state (a fresh copy)"""
+        return self.ψ_re + 1j * self.ψ_im
+    
+    @ψ.setter
+    def ψ(self, value):
+        value = np.asarray(value, dtype=complex)
+        self.ψ_re = np.ascontiguousarray(value.real)
+        self.ψ_im = np.ascontiguousarray(value.imag)
+    
+    def CX(self, c, t):
+        """CNOT: control=c, target=t"""
+        # Swap the target=0/1 halves of the control=1 block, plane by plane
+        lo = [slice(None)] * self.n
+        lo[c] = 1
+        hi = list(lo)
+        lo[t], hi[t] = 0, 1
+        lo, hi = tuple(lo), tuple(hi)
+        for plane in (self.ψ_re, self.ψ_im):
+            ψ = plane.reshape([2] * self.n)
+            tmp = ψ[lo].copy()
+            ψ[lo] = ψ[hi]
+            ψ[hi] = tmp
+        return self
+    
+    def show(self):
+        """Show state vector"""
+        print("State vector:")
+        re, im = self.ψ_re, self.ψ_im
+        for i in np.flatnonzero(self._probabilities() > 1e-20):
+            state = format(i, f'0{self.n}b')
+            print(f"  |{state}⟩: {complex(re[i], im[i]):.4f}")
+    
+    def _probabilities(self):
+        """re² + im² straight from the planes"""
+        np.multiply(self.ψ_re, self.ψ_re, out=self._p)
+        self._p += self.ψ_im * self.ψ_im
+        return self._p
+    
+    def _apply(self, gate, q):
+        """Apply single-qubit gate to qubit q using real arithmetic only"""
+        # (outer, qubit q, inner) view: each row k of the gate mixes the
+        # q=0 and q=1 slabs, written as real multiply-adds per plane
+        shape = (1 << q, 2, 1 << (self.n - q - 1))
+        re, im = self.ψ_re.reshape(shape), self.ψ_im.reshape(shape)
+        out_re, out_im = self._re2.reshape(shape), self._im2.reshape(shape)
+        gr, gi = gate.real, gate.imag
+        if gate[0, 1] == 0 and gate[1, 0] == 0:
+            # Diagonal (Z, RZ): scale each slab in place, no back buffer
+            for k in range(2):
+                a, b = gr[k, k], gi[k, k]
+                if b == 0:
+                    if a != 1:
+                        re[:, k] *= a
+                        im[:, k] *= a
+                    continue
+                r = re[:, k].copy()
+                re[:, k] *= a
+                re[:, k] -= b * im[:, k]
+                im[:, k] *= a
+                im[:, k] += b * r
+            return self
+        r0, r1, i0, i1 = re[:, 0], re[:, 1], im[:, 0], im[:, 1]
+        real_gate = not gi.any()  # H, X, Z, RY: skip the cross terms
+        for k in range(2):
+            a, b = gr[k]
+            out_re[:, k] = a * r0 + b * r1
+            out_im[:, k] = a * i0 + b * i1
+            if not real_gate:
+                a, b = gi[k]
+                out_re[:, k] -= a * i0 + b * i1
+                out_im[:, k] += a * r0 + b * r1
+        self.ψ_re, self._re2 = self._re2, self.ψ_re
+        self.ψ_im, self._im2 = self._im2, self.ψ_im
+        return self
 
 
 # Quick demos
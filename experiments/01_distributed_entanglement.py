@@ -9,9 +9,15 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
+from itertools import combinations
+
+# LED visualization: BR_VIZ=0 or --no-viz skips it, BR_VIZ_DELAY sets the
+# blink period (BR_VIZ=0 BR_VIZ_DELAY=0 for CI/benchmark runs)
+VIZ_ENABLED = os.environ.get('BR_VIZ', '1') == '1' and '--no-viz' not in sys.argv
+VIZ_DELAY = float(os.environ.get('BR_VIZ_DELAY', '0.1'))
 
 print("="*80)
 print("EXPERIMENT 01: DISTRIBUTED QUANTUM ENTANGLEMENT")
@@ -41,67 +47,68 @@ kpis = {
 # Create Bell states across all device pairs
 print(f"\n🔗 Creating Bell States Across Device Pairs...")
 
+shots = 1000
+
+
+def simulate_bell_pair(job):
+    """Bell state + measurement counts for one device pair"""
+    pair, seed = job
+    qc = BlackRoadQuantum(n_qubits=2, use_hardware=False, seed=seed).bell()
+    # Count outcomes (dense, indexed by outcome)
+    return pair, qc.sample_counts(shots=shots)
+
+
+# Simulate every pair first, then visualize serially. Each job takes
+# microseconds, so a process pool's startup would cost more than the work
+hostnames = [d.hostname for d in active[:3]]
+pairs = list(combinations(hostnames, 2))
+# Independent child seeds, one RNG stream per pair
+jobs = list(zip(pairs, np.random.SeedSequence().spawn(len(pairs))))
+simulated = list(map(simulate_bell_pair, jobs))
+
 bell_results = []
-for i in range(min(len(active), 3)):
-    for j in range(i+1, min(len(active), 3)):
-        device1 = active[i].hostname
-        device2 = active[j].hostname
-
-        print(f"\n   Testing: {device1} ↔ {device2}")
-
-        # Create Bell state
-        qc = BlackRoadQuantum(n_qubits=2, use_hardware=False)
-        qc.bell()
-
-        # Measure correlation
-        shots = 1000
-        results = qc.measure(shots=shots)
-
-        # Count outcomes
-        unique, counts = np.unique(results, return_counts=True)
-        outcome_counts = dict(zip(unique, counts))
-
-        # Calculate correlation
-        count_00 = outcome_counts.get(0, 0)  # |00⟩
-        count_11 = outcome_counts.get(3, 0)  # |11⟩
-        count_01 = outcome_counts.get(1, 0)  # |01⟩
-        count_10 = outcome_counts.get(2, 0)  # |10⟩
-
-        correlation = (count_00 + count_11 - count_01 - count_10) / shots
-
-        print(f"      |00⟩: {count_00} ({count_00/shots*100:.1f}%)")
-        print(f"      |11⟩: {count_11} ({count_11/shots*100:.1f}%)")
-        print(f"      |01⟩: {count_01} ({count_01/shots*100:.1f}%)")
-        print(f"      |10⟩: {count_10} ({count_10/shots*100:.1f}%)")
-        print(f"      Correlation: {correlation:.3f}")
-
-        # Flash LEDs to show entanglement
-        for _ in range(3):
-            hardware.set_photon(device1, 'ACT', 255)
-            hardware.set_photon(device2, 'ACT', 0)
-            time.sleep(0.1)
-            hardware.set_photon(device1, 'ACT', 0)
-            hardware.set_photon(device2, 'ACT', 255)
-            time.sleep(0.1)
+for (device1, device2), counts in simulated:
+    print(f"\n   Testing: {device1} ↔ {device2}")
+
+    # Calculate correlation
+    count_00 = counts[0]  # |00⟩
+    count_11 = counts[3]  # |11⟩
+    count_01 = counts[1]  # |01⟩
+    count_10 = counts[2]  # |10⟩
+
+    correlation = (count_00 + count_11 - count_01 - count_10) / shots
+
+    print(f"      |00⟩: {count_00} ({count_00/shots*100:.1f}%)")
+    print(f"      |11⟩: {count_11} ({count_11/shots*100:.1f}%)")
+    print(f"      |01⟩: {count_01} ({count_01/shots*100:.1f}%)")
+    print(f"      |10⟩: {count_10} ({count_10/shots*100:.1f}%)")
+    print(f"      Correlation: {correlation:.3f}")
+
+    # Flash LEDs to show entanglement
+    if VIZ_ENABLED:
+        # Alternate the two LEDs three times, then switch both off
+        schedule = [(255, 0), (0, 255)] * 3
+        for v1, v2 in schedule:
+            hardware.set_photon_many([(device1, 'ACT', v1), (device2, 'ACT', v2)])
+            time.sleep(VIZ_DELAY)
 
         # Reset
-        hardware.set_photon(device1, 'ACT', 0)
-        hardware.set_photon(device2, 'ACT', 0)
-
-        bell_results.append({
-            'device1': device1,
-            'device2': device2,
-            'correlation': float(correlation),
-            'outcomes': {
-                '00': int(count_00),
-                '11': int(count_11),
-                '01': int(count_01),
-                '10': int(count_10)
-            }
-        })
+        hardware.set_photon_many([(device1, 'ACT', 0), (device2, 'ACT', 0)])
+
+    bell_results.append({
+        'device1': device1,
+        'device2': device2,
+        'correlation': correlation,
+        'outcomes': {
+            '00': count_00,
+            '11': count_11,
+            '01': count_01,
+            '10': count_10
+        }
+    })
 
 kpis['bell_states'] = bell_results
-kpis['avg_correlation'] = float(np.mean([r['correlation'] for r in bell_results]))
+kpis['avg_correlation'] = np.mean([r['correlation'] for r in bell_results])
 
 # Test GHZ state (all devices)
 print(f"\n🌐 Creating GHZ State Across All {len(active)} Devices...")
@@ -110,43 +117,46 @@ n_qubits = hardware.total_qubits()
 qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=True)
 
 start = time.time()
-qc.ghz()
+qc.ghz(reset=True)
 ghz_time = time.time() - start
 
 print(f"   ✅ GHZ state created in {ghz_time*1000:.2f}ms")
 
 # Visualize on hardware
-print(f"\n💡 Visualizing GHZ state...")
-for device in active:
-    hardware.set_photon(device.hostname, 'ACT', 128)
-    print(f"   {device.hostname}: |superposition⟩")
+if VIZ_ENABLED:
+    print(f"\n💡 Visualizing GHZ state...")
+    for device in active:
+        hardware.set_photon(device.hostname, 'ACT', 128)
+        print(f"   {device.hostname}: |superposition⟩")
 
-time.sleep(1)
+    time.sleep(10 * VIZ_DELAY)  # 1s hold at the default delay
 
 # Measure
-results = qc.measure(shots=100)
-unique, counts = np.unique(results, return_counts=True)
+counts = qc.sample_counts(shots=100)
+unique = np.flatnonzero(counts)
+counts = counts[unique]
+# Bit-string labels for the observed outcomes only, shared by print and KPIs
+labels = [format(o, f'0{n_qubits}b') for o in unique.tolist()]
 
 print(f"\n📊 GHZ Measurement Results (100 shots):")
-for outcome, count in zip(unique, counts):
-    binary = format(outcome, f'0{n_qubits}b')
+for binary, count in zip(labels, counts):
     print(f"   |{binary}⟩: {count} ({count/100*100:.1f}%)")
 
 kpis['ghz_state'] = {
-    'creation_time_ms': float(ghz_time * 1000),
+    'creation_time_ms': ghz_time * 1000,
     'n_qubits': n_qubits,
-    'measurement_results': {format(o, f'0{n_qubits}b'): int(c) for o, c in zip(unique, counts)}
+    'measurement_results': dict(zip(labels, counts))
 }
 
 # Clean up
-for device in active:
-    hardware.set_photon(device.hostname, 'ACT', 0)
+if VIZ_ENABLED:
+    for device in active:
+        hardware.set_photon(device.hostname, 'ACT', 0)
 
 # Save KPIs
 print(f"\n💾 Saving KPIs...")
 kpi_file = f"/tmp/experiment_01_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"   Saved to: {kpi_file}")
 
@@ -9,8 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
 print("="*100)
@@ -23,6 +23,17 @@ kpis = {
     'qudit_tests': []
 }
 
+# One simulator per (n_qudits, n_levels) shape, reset between uses
+sims = {}
+
+def simulator(n_qudits, n_levels):
+    qc = sims.get((n_qudits, n_levels))
+    if qc is None:
+        qc = sims[(n_qudits, n_levels)] = BlackRoadQuantum(
+            n_qubits=n_qudits, n_levels=n_levels, use_hardware=False,
+            dtype=np.complex64)
+    return qc.reset()
+
 # Test different qudit levels
 qudit_levels = [
     (2, 'Qubit', 'Standard 2-level quantum system'),
@@ -47,54 +58,45 @@ for n_levels, name, desc in qudit_levels:
     print(f"   Total Hilbert space: {n_levels}^{n_qudits} = {total_dim:,} states")
 
     # Create qudit quantum computer
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=n_levels, use_hardware=False)
+    qc = simulator(n_qudits, n_levels)
 
     # Test 1: Superposition
     print(f"\n🌊 Test 1: Superposition across all {n_levels} levels")
     start = time.time()
-    for i in range(n_qudits):
-        qc.H(i)  # Hadamard creates equal superposition
+    qc.H_all()  # Hadamard on every qudit creates equal superposition
     superposition_time = time.time() - start
 
     print(f"   Time: {superposition_time*1000:.2f}ms")
     print(f"   State dimension: {qc.state.dim}")
 
     # Measure
-    results = qc.measure(shots=100)
-    unique, counts = np.unique(results, return_counts=True)
+    counts = qc.sample_counts(shots=100)
 
     print(f"\n   Measurement distribution (showing top 5):")
-    sorted_idx = np.argsort(counts)[::-1][:5]
-    for idx in sorted_idx:
-        outcome = unique[idx]
-        count = counts[idx]
-        # Convert to base-n representation
-        digits = []
-        temp = outcome
-        for _ in range(n_qudits):
-            digits.append(temp % n_levels)
-            temp //= n_levels
-        state_str = ''.join(str(d) for d in reversed(digits))
+    k = min(5, counts.size)  # argpartition needs k <= size
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(counts[top])[::-1]]
+    top = top[counts[top] > 0]
+    # Base-n digits of every shown outcome at once (most significant first)
+    powers = n_levels ** np.arange(n_qudits - 1, -1, -1)
+    digits = (top[:, None] // powers) % n_levels
+    for outcome, row in zip(top, digits.tolist()):
+        count = counts[outcome]
+        state_str = ''.join(map(str, row))
         print(f"      |{state_str}⟩: {count} ({count/100*100:.1f}%)")
 
     # Test 2: Entanglement
     print(f"\n🔗 Test 2: {name} Entanglement")
-    qc = BlackRoadQuantum(n_qubits=2, n_levels=n_levels, use_hardware=False)
+    qc = simulator(2, n_levels)
 
     start = time.time()
     qc.H(0).CX(0, 1)  # Create Bell-like state for qudits
     entanglement_time = time.time() - start
 
-    results = qc.measure(shots=1000)
-    unique, counts = np.unique(results, return_counts=True)
+    counts = qc.sample_counts(shots=1000)
 
-    # Check correlation
-    correlation_states = 0
-    for outcome, count in zip(unique, counts):
-        d0 = outcome % n_levels
-        d1 = outcome // n_levels
-        if d0 == d1:  # Correlated states
-            correlation_states += count
+    # Check correlation: |kk⟩ sits at outcome k·(d+1), a strided diagonal
+    correlation_states = counts[::n_levels + 1].sum()
 
     correlation = correlation_states / 1000
 
@@ -102,12 +104,13 @@ for n_levels, name, desc in qudit_levels:
     print(f"   Correlation: {correlation:.3f}")
     print(f"   Top correlated states:")
 
-    sorted_idx = np.argsort(counts)[::-1][:min(5, len(counts))]
-    for idx in sorted_idx:
-        outcome = unique[idx]
-        count = counts[idx]
-        d0 = outcome % n_levels
-        d1 = outcome // n_levels
+    k = min(5, counts.size)
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(counts[top])[::-1]]
+    top = top[counts[top] > 0]
+    d1s, d0s = np.divmod(top, n_levels)
+    for outcome, d0, d1 in zip(top, d0s.tolist(), d1s.tolist()):
+        count = counts[outcome]
         print(f"      |{d0}{d1}⟩: {count} ({count/1000*100:.1f}%)")
 
     # Test 3: Information capacity
@@ -130,13 +133,13 @@ for n_levels, name, desc in qudit_levels:
         'name': name,
         'n_levels': n_levels,
         'n_qudits': n_qudits,
-        'total_states': int(total_dim),
-        'superposition_time_ms': float(superposition_time * 1000),
-        'entanglement_time_ms': float(entanglement_time * 1000),
-        'correlation': float(correlation),
-        'bits_needed': float(bits_needed),
-        'qubit_equivalent': float(qubit_equivalent),
-        'qudit_advantage': float(qudit_advantage)
+        'total_states': total_dim,
+        'superposition_time_ms': superposition_time * 1000,
+        'entanglement_time_ms': entanglement_time * 1000,
+        'correlation': correlation,
+        'bits_needed': bits_needed,
+        'qubit_equivalent': qubit_equivalent,
+        'qudit_advantage': qudit_advantage
     })
 
 # Hardware test with LEDs (if available)
@@ -197,8 +200,7 @@ print(f"   for the same number of physical systems!")
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_03_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
@@ -9,8 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
 print("="*100)
@@ -18,6 +18,17 @@ print("EXPERIMENT 04: GEOMETRIC QUANTUM SYSTEMS")
 print("Qutrits, Polyhedrons & Trinary Computing")
 print("="*100)
 
+# One simulator per (n_qudits, n_levels) shape, reset between uses
+sims = {}
+
+def simulator(n_qudits, n_levels):
+    qc = sims.get((n_qudits, n_levels))
+    if qc is None:
+        qc = sims[(n_qudits, n_levels)] = BlackRoadQuantum(
+            n_qubits=n_qudits, n_levels=n_levels, use_hardware=False,
+            dtype=np.complex64)
+    return qc.reset()
+
 kpis = {
     'experiment': '04_geometric_quantum',
     'timestamp': time.time(),
@@ -38,31 +49,29 @@ print(f"   |1⟩ = Maybe/Superposition")
 print(f"   |2⟩ = True/On")
 
 # Qutrit gates
-qc = BlackRoadQuantum(n_qubits=3, n_levels=3, use_hardware=False)
+qc = simulator(3, 3)
 
 print(f"\n🔺 Creating Qutrit Superposition...")
 start = time.time()
-for i in range(3):
-    qc.H(i)  # Hadamard for qutrits
+qc.H_all()  # Hadamard for qutrits
 qutrit_time = time.time() - start
 
 print(f"   Time: {qutrit_time*1000:.2f}ms")
 print(f"   States: 3^3 = 27")
 
 # Measure qutrit distribution
-results = qc.measure(shots=1000)
-unique, counts = np.unique(results, return_counts=True)
+counts = qc.sample_counts(shots=1000)
 
 # Convert to trinary
 print(f"\n   Trinary Distribution (showing top 5):")
-sorted_idx = np.argsort(counts)[::-1][:5]
-for idx in sorted_idx:
-    outcome = unique[idx]
-    count = counts[idx]
-    # Convert to base-3
-    t0 = outcome % 3
-    t1 = (outcome // 3) % 3
-    t2 = (outcome // 9) % 3
+k = min(5, counts.size)  # argpartition needs k <= size
+top = np.argpartition(counts, -k)[-k:]
+top = top[np.argsort(counts[top])[::-1]]
+top = top[counts[top] > 0]
+# Convert to base-3: trits of all shown outcomes in one pass
+trits = (top[:, None] // np.array([9, 3, 1])) % 3
+for outcome, (t2, t1, t0) in zip(top, trits.tolist()):
+    count = counts[outcome]
     print(f"      |{t2}{t1}{t0}⟩ ({t2}{t1}{t0}₃): {count} ({count/1000*100:.1f}%)")
 
 # Trinary logic gates
@@ -86,7 +95,7 @@ kpis['tests'].append({
     'n_levels': 3,
     'n_qudits': 3,
     'total_states': 27,
-    'creation_time_ms': float(qutrit_time * 1000),
+    'creation_time_ms': qutrit_time * 1000,
     'trinary_gates': list(trinary_ops.keys())
 })
 
@@ -132,18 +141,16 @@ for name, vertices, desc in polyhedra:
     print(f"   Quantum representation: {n_qudits} qudits of level {n_levels} = {total_states} states")
 
     # Create superposition
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=n_levels, use_hardware=False)
+    qc = simulator(n_qudits, n_levels)
 
     start = time.time()
-    for i in range(n_qudits):
-        qc.H(i)
+    qc.H_all()
     poly_time = time.time() - start
 
     print(f"   Superposition time: {poly_time*1000:.2f}ms")
 
     # Measure
-    results = qc.measure(shots=100)
-    unique_states = len(np.unique(results))
+    unique_states = np.count_nonzero(qc.sample_counts(shots=100))
     print(f"   Unique states measured: {unique_states}/{total_states}")
 
     kpis['tests'].append({
@@ -152,8 +159,8 @@ for name, vertices, desc in polyhedra:
         'n_qudits': n_qudits,
         'n_levels': n_levels,
         'total_states': total_states,
-        'superposition_time_ms': float(poly_time * 1000),
-        'unique_states': int(unique_states)
+        'superposition_time_ms': poly_time * 1000,
+        'unique_states': unique_states
     })
 
 # ============================================================================
@@ -181,15 +188,12 @@ for shape, sides, meaning in patterns:
 
     # Create ring of entangled qutrits
     n_qudits = sides
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=3, use_hardware=False)
+    qc = simulator(n_qudits, 3)
 
     start = time.time()
 
-    # Entangle in ring pattern: 0-1, 1-2, 2-3, ..., (n-1)-0
-    qc.H(0)  # Start with superposition
-    for i in range(n_qudits):
-        next_i = (i + 1) % n_qudits
-        qc.CX(i, next_i)  # Entangle neighbors
+    # Entangle in ring pattern: H(0), then CX 0-1, 1-2, 2-3, ..., (n-1)-0
+    qc.ring_entangle()
 
     pattern_time = time.time() - start
 
@@ -202,7 +206,7 @@ for shape, sides, meaning in patterns:
     print(f"↔0 (closed loop)")
 
     # Measure correlation
-    results = qc.measure(shots=1000)
+    counts = qc.sample_counts(shots=1000)
     entropy = qc.state.entropy()
 
     print(f"   Entropy: {entropy:.3f} bits")
@@ -211,8 +215,8 @@ for shape, sides, meaning in patterns:
         'name': f'{shape} Pattern',
         'sides': sides,
         'n_qudits': n_qudits,
-        'entanglement_time_ms': float(pattern_time * 1000),
-        'entropy_bits': float(entropy),
+        'entanglement_time_ms': pattern_time * 1000,
+        'entropy_bits': entropy,
         'pattern_type': 'ring'
     })
 
@@ -238,6 +242,15 @@ if len(active) > 0:
         (255, '(overflow)', 'Maximum (beyond trinary)')
     ]
 
+    # (brightness, label) frames for the counting demo, formatted up front
+    counting_schedule = []
+    for t0 in range(3):
+        for t1 in range(3):
+            brightness = int((t1 * 3 + t0) / 8 * 255)
+            counting_schedule.append((brightness, f"      {t1}{t0}₃ = brightness {brightness:3d}"))
+    # Animate in place only on a terminal; logs/pipes get one write afterwards
+    live_counter = sys.stdout.isatty()
+
     for device in active[:2]:
         print(f"\n   💡 {device.hostname}:")
         for brightness, label, meaning in trinary_states:
@@ -247,13 +260,15 @@ if len(active) > 0:
 
         # Demo trinary counting: 00₃ → 01₃ → 02₃ → 10₃ → 11₃ → 12₃ → 20₃ → 21₃ → 22₃
         print(f"\n   🔢 Trinary Counting Demo (00₃ to 22₃):")
-        for t0 in range(3):
-            for t1 in range(3):
-                brightness = int((t1 * 3 + t0) / 8 * 255)
-                hardware.set_photon(device.hostname, 'ACT', brightness)
-                print(f"      {t1}{t0}₃ = brightness {brightness:3d}", end='\r')
-                time.sleep(0.2)
-        print()
+        for brightness, label in counting_schedule:
+            hardware.set_photon_many([(device.hostname, 'ACT', brightness)])
+            if live_counter:
+                print(label, end='\r', flush=True)
+            time.sleep(0.2)
+        if live_counter:
+            print()
+        else:
+            sys.stdout.write('\n'.join(label for _, label in counting_schedule) + '\n')
 
         # Reset
         hardware.set_photon(device.hostname, 'ACT', 0)
@@ -277,31 +292,29 @@ print(f"{'='*100}")
 
 print(f"\nInformation Density Comparison:")
 
-data_sizes = [1, 2, 3, 4, 5, 8, 10]
+data_sizes = np.array([1, 2, 3, 4, 5, 8, 10])
 
 print(f"\n{'Symbols':<10} {'Binary Bits':<15} {'Trinary Trits':<15} {'Efficiency':<15}")
 print("-"*60)
 
-efficiency_ratios = []
-
-for n in data_sizes:
-    binary_states = 2 ** n
-    trinary_states = 3 ** n
-
-    # How many trits needed for same states as n bits?
-    trits_needed = np.log(binary_states) / np.log(3)
+# Whole table at once (int64 is exact up to 3**39)
+binary_states = 2 ** data_sizes
+trinary_states = 3 ** data_sizes
 
-    # Efficiency: states per symbol
-    binary_density = binary_states / n
-    trinary_density = trinary_states / n
+# How many trits needed for same states as n bits? log₃(2ⁿ) = n / log₂(3)
+trits_needed = data_sizes / np.log2(3)
 
-    efficiency = trinary_density / binary_density
+# Efficiency: states per symbol
+binary_density = binary_states / data_sizes
+trinary_density = trinary_states / data_sizes
 
-    print(f"{n:<10} {binary_states:<15} {trinary_states:<15} {efficiency:<15.2f}×")
+efficiency_ratios = trinary_density / binary_density
 
-    efficiency_ratios.append(efficiency)
+for n, b, t, e in zip(data_sizes.tolist(), binary_states.tolist(),
+                      trinary_states.tolist(), efficiency_ratios.tolist()):
+    print(f"{n:<10} {b:<15} {t:<15} {e:<15.2f}×")
 
-avg_efficiency = np.mean(efficiency_ratios)
+avg_efficiency = efficiency_ratios.mean()
 
 print(f"\n🎯 Result:")
 print(f"   Average trinary efficiency: {avg_efficiency:.2f}×")
@@ -309,8 +322,8 @@ print(f"   Trinary uses ~37% more information per symbol")
 print(f"   (log₂(3) ≈ 1.585 bits per trit vs 1 bit per bit)")
 
 kpis['trinary_efficiency'] = {
-    'average_efficiency': float(avg_efficiency),
-    'bits_per_trit': float(np.log2(3)),
+    'average_efficiency': avg_efficiency,
+    'bits_per_trit': np.log2(3),
     'advantage': 'Higher information density per physical state'
 }
 
@@ -346,8 +359,7 @@ if kpis['hardware_demo']:
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_04_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
@@ -9,10 +9,22 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
+import math
 import time
 
+# One simulator per (n_qudits, d) shape, reset between uses: the prime and
+# Fibonacci sweeps revisit the same shapes
+sims = {}
+
+def simulator(n_qudits, d):
+    qc = sims.get((n_qudits, d))
+    if qc is None:
+        qc = sims[(n_qudits, d)] = BlackRoadQuantum(
+            n_qubits=n_qudits, n_levels=d, use_hardware=False, dtype=np.complex64)
+    return qc.reset()
+
 print("="*100)
 print("EXPERIMENT 05: INFINITE QUDIT CASCADE")
 print("Level ∞: Maximum Quantum Complexity")
@@ -40,7 +52,8 @@ n_qudits = 3  # Keep manageable
 print(f"\n{'Level (d)':<12} {'Qudits':<8} {'Total States':<15} {'Creation Time':<15} {'Memory':<15}")
 print("-"*80)
 
-cascade_results = []
+# Results are kept column-wise (one array per field) for the KPIs and summary
+levels, states, times, memory = [], [], [], []
 
 for d in qudit_cascade:
     total_states = d ** n_qudits
@@ -51,28 +64,31 @@ for d in qudit_cascade:
         continue
     
     try:
-        qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=d, use_hardware=False)
+        qc = simulator(n_qudits, d)
         
         start = time.time()
-        for i in range(n_qudits):
-            qc.H(i)
+        qc.prepare_uniform()
         creation_time = time.time() - start
         
         memory_mb = qc.state.ψ.nbytes / (1024 * 1024)
         
         print(f"{d:<12} {n_qudits:<8} {total_states:<15,} {creation_time*1000:<15.2f}ms {memory_mb:<15.3f}MB")
         
-        cascade_results.append({
-            'level': int(d),
-            'n_qudits': n_qudits,
-            'total_states': int(total_states),
-            'creation_time_ms': float(creation_time * 1000),
-            'memory_mb': float(memory_mb)
-        })
+        levels.append(d)
+        states.append(total_states)
+        times.append(creation_time)
+        memory.append(memory_mb)
         
     except Exception as e:
         print(f"{d:<12} {n_qudits:<8} {total_states:<15,} {'ERROR':<15} {str(e)[:15]}")
 
+cascade_results = {
+    'n_qudits': n_qudits,
+    'level': np.array(levels),
+    'total_states': np.array(states),
+    'creation_time_ms': np.array(times) * 1000,
+    'memory_mb': np.array(memory),
+}
 kpis['cascade'] = cascade_results
 
 # ============================================================================
@@ -97,7 +113,7 @@ entanglement_tests = [
 print(f"\n{'Config':<20} {'Qudits':<8} {'States':<15} {'Entangle Time':<15} {'Entropy':<15}")
 print("-"*80)
 
-extreme_results = []
+labels, qudits, levels, states, times, entropies = [], [], [], [], [], []
 
 for n_qudits, d, label in entanglement_tests:
     total_states = d ** n_qudits
@@ -107,7 +123,7 @@ for n_qudits, d, label in entanglement_tests:
         continue
     
     try:
-        qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=d, use_hardware=False)
+        qc = simulator(n_qudits, d)
         
         start = time.time()
         # Create GHZ-like state: all-to-all entanglement
@@ -120,18 +136,24 @@ for n_qudits, d, label in entanglement_tests:
         
         print(f"{label:<20} {n_qudits:<8} {total_states:<15,} {entangle_time*1000:<15.2f}ms {entropy:<15.3f}")
         
-        extreme_results.append({
-            'label': label,
-            'n_qudits': n_qudits,
-            'level': d,
-            'total_states': int(total_states),
-            'entanglement_time_ms': float(entangle_time * 1000),
-            'entropy_bits': float(entropy)
-        })
+        labels.append(label)
+        qudits.append(n_qudits)
+        levels.append(d)
+        states.append(total_states)
+        times.append(entangle_time)
+        entropies.append(entropy)
         
     except Exception as e:
         print(f"{label:<20} {n_qudits:<8} {total_states:<15,} {'ERROR':<15} {str(e)[:15]}")
 
+extreme_results = {
+    'label': labels,
+    'n_qudits': np.array(qudits),
+    'level': np.array(levels),
+    'total_states': np.array(states),
+    'entanglement_time_ms': np.array(times) * 1000,
+    'entropy_bits': np.array(entropies),
+}
 kpis['extreme_entanglement'] = extreme_results
 
 # ============================================================================
@@ -150,24 +172,21 @@ levels_to_test = [2, 3, 4, 5, 8, 10, 16]
 print(f"\n{'System':<15} {'Physical':<12} {'States':<15} {'Classical Bits':<15} {'Advantage':<15}")
 print("-"*80)
 
-density_results = []
+total_states = np.array(levels_to_test) ** n_qudits
+density_results = {
+    'n_qudits': n_qudits,
+    'level': np.array(levels_to_test),
+    'total_states': total_states,
+    'classical_bits': np.log2(total_states),
+    'advantage': total_states / (2 ** n_qudits),
+}
 
-for d in levels_to_test:
-    total_states = d ** n_qudits
-    classical_bits = np.log2(total_states)
-    advantage = total_states / (2 ** n_qudits)
-    
+for d, total_states, classical_bits, advantage in zip(
+        levels_to_test, density_results['total_states'].tolist(),
+        density_results['classical_bits'].tolist(), density_results['advantage'].tolist()):
     system_name = f"d={d}"
     
     print(f"{system_name:<15} {n_qudits:<12} {total_states:<15,} {classical_bits:<15.1f} {advantage:<15.1f}×")
-    
-    density_results.append({
-        'level': int(d),
-        'n_qudits': n_qudits,
-        'total_states': int(total_states),
-        'classical_bits': float(classical_bits),
-        'advantage': float(advantage)
-    })
 
 kpis['information_density'] = density_results
 
@@ -184,10 +203,20 @@ print(f"\nExploring quantum systems based on prime numbers...")
 primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31]
 n_qudits = 2  # Keep small for large primes
 
+# Special properties of primes (anything else is labelled Prime-p)
+prime_properties = {
+    2: "Binary (standard qubits)",
+    3: "Trinary (qutrits)",
+    5: "Pentary (quints)",
+    7: "Septenary (septets)",
+    11: "Undenary",
+    13: "Tridecimal",
+}
+
 print(f"\n{'Prime (d)':<12} {'Qudits':<8} {'States':<15} {'Time':<15} {'Special Property':<30}")
 print("-"*90)
 
-prime_results = []
+levels, states, times, properties = [], [], [], []
 
 for p in primes:
     total_states = p ** n_qudits
@@ -196,39 +225,28 @@ for p in primes:
         print(f"{p:<12} {n_qudits:<8} {total_states:<15,} {'SKIPPED':<15} {'Too large for demo':<30}")
         continue
     
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=p, use_hardware=False)
+    qc = simulator(n_qudits, p)
     
     start = time.time()
-    for i in range(n_qudits):
-        qc.H(i)
+    qc.prepare_uniform()
     creation_time = time.time() - start
     
-    # Special properties of primes
-    if p == 2:
-        prop = "Binary (standard qubits)"
-    elif p == 3:
-        prop = "Trinary (qutrits)"
-    elif p == 5:
-        prop = "Pentary (quints)"
-    elif p == 7:
-        prop = "Septenary (septets)"
-    elif p == 11:
-        prop = "Undenary"
-    elif p == 13:
-        prop = "Tridecimal"
-    else:
-        prop = f"Prime-{p}"
+    prop = prime_properties.get(p, f"Prime-{p}")
     
     print(f"{p:<12} {n_qudits:<8} {total_states:<15,} {creation_time*1000:<15.2f}ms {prop:<30}")
     
-    prime_results.append({
-        'prime': int(p),
-        'n_qudits': n_qudits,
-        'total_states': int(total_states),
-        'creation_time_ms': float(creation_time * 1000),
-        'property': prop
-    })
-
+    levels.append(p)
+    states.append(total_states)
+    times.append(creation_time)
+    properties.append(prop)
+
+prime_results = {
+    'n_qudits': n_qudits,
+    'prime': np.array(levels),
+    'total_states': np.array(states),
+    'creation_time_ms': np.array(times) * 1000,
+    'property': properties,
+}
 kpis['prime_systems'] = prime_results
 
 # ============================================================================
@@ -247,36 +265,39 @@ n_qudits = 2
 print(f"\n{'Fib (d)':<12} {'Qudits':<8} {'States':<15} {'Time':<15} {'Golden Ratio':<15}")
 print("-"*80)
 
-fib_results = []
+levels, states, times, deviations = [], [], [], []
 
-for f in fibonacci:
+for idx, f in enumerate(fibonacci):
     total_states = f ** n_qudits
     
     if total_states > 50000:
         print(f"{f:<12} {n_qudits:<8} {total_states:<15,} {'SKIPPED':<15} {'Too large':<15}")
         continue
     
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=f, use_hardware=False)
+    qc = simulator(n_qudits, f)
     
     start = time.time()
-    for i in range(n_qudits):
-        qc.H(i)
+    qc.prepare_uniform()
     creation_time = time.time() - start
     
     # Ratio to golden ratio (phi ≈ 1.618)
     phi = 1.618033988749895
-    golden_ratio_deviation = abs(f / fibonacci[fibonacci.index(f) - 1] - phi) if f != fibonacci[0] else 0
+    golden_ratio_deviation = abs(f / fibonacci[idx - 1] - phi) if idx > 0 else 0
     
     print(f"{f:<12} {n_qudits:<8} {total_states:<15,} {creation_time*1000:<15.2f}ms {golden_ratio_deviation:<15.3f}")
     
-    fib_results.append({
-        'fibonacci': int(f),
-        'n_qudits': n_qudits,
-        'total_states': int(total_states),
-        'creation_time_ms': float(creation_time * 1000),
-        'golden_deviation': float(golden_ratio_deviation)
-    })
-
+    levels.append(f)
+    states.append(total_states)
+    times.append(creation_time)
+    deviations.append(golden_ratio_deviation)
+
+fib_results = {
+    'n_qudits': n_qudits,
+    'fibonacci': np.array(levels),
+    'total_states': np.array(states),
+    'creation_time_ms': np.array(times) * 1000,
+    'golden_deviation': np.array(deviations),
+}
 kpis['fibonacci_systems'] = fib_results
 
 # ============================================================================
@@ -297,24 +318,26 @@ if len(active) > 0:
     # Use 16-level quantum system for smooth spectrum
     rainbow_levels = 16
     
-    for device in active[:2]:
-        print(f"\n   🌈 {device.hostname}: 16-level quantum spectrum")
-        
-        for level in range(rainbow_levels):
-            brightness = int((level / (rainbow_levels - 1)) * 255)
-            hardware.set_photon(device.hostname, 'ACT', brightness)
-            print(f"      Level {level:2d}/{rainbow_levels}: brightness {brightness:3d}", end='\r')
-            time.sleep(0.15)
-        print()
-        
-        # Reverse
-        for level in range(rainbow_levels - 1, -1, -1):
-            brightness = int((level / (rainbow_levels - 1)) * 255)
-            hardware.set_photon(device.hostname, 'ACT', brightness)
-            time.sleep(0.15)
-        
-        # Reset
-        hardware.set_photon(device.hostname, 'ACT', 0)
+    # All devices step through the spectrum together: one sleep per frame
+    devices = [d.hostname for d in active[:2]]
+    print(f"\n   🌈 {', '.join(devices)}: 16-level quantum spectrum")
+    
+    # Brightness per level, computed once for both sweeps
+    ramp = np.linspace(0, 255, rainbow_levels, dtype=np.uint8).tolist()
+    
+    for level, brightness in enumerate(ramp):
+        hardware.set_photon_many([(h, 'ACT', brightness) for h in devices], wait=False)
+        print(f"      Level {level:2d}/{rainbow_levels}: brightness {brightness:3d}", end='\r')
+        time.sleep(0.15)
+    print()
+    
+    # Reverse
+    for brightness in reversed(ramp):
+        hardware.set_photon_many([(h, 'ACT', brightness) for h in devices], wait=False)
+        time.sleep(0.15)
+    
+    # Reset
+    hardware.set_photon_many([(h, 'ACT', 0) for h in devices])
     
     kpis['hardware_demo'] = {
         'devices': [d.hostname for d in active],
@@ -335,7 +358,7 @@ print(f"{'='*100}")
 
 print(f"\nCalculating theoretical limits of quantum systems...")
 
-theoretical = []
+labels, qudits, levels, log_states_all, bits = [], [], [], [], []
 
 configs = [
     (100, 2, "100 qubits (Google's target)"),
@@ -351,8 +374,8 @@ print("-"*80)
 
 for n_qudits, d, label in configs:
     # Calculate log to avoid overflow
-    log_states = n_qudits * np.log10(d)
-    classical_bits = n_qudits * np.log2(d)
+    log_states = n_qudits * math.log10(d)
+    classical_bits = n_qudits * math.log2(d)
     
     if log_states < 10:
         states_str = f"{d**n_qudits:,.0f}"
@@ -361,14 +384,19 @@ for n_qudits, d, label in configs:
     
     print(f"{label:<30} {states_str:<25} {classical_bits:<20.1f}")
     
-    theoretical.append({
-        'label': label,
-        'n_qudits': n_qudits,
-        'level': d,
-        'log10_states': float(log_states),
-        'classical_bits': float(classical_bits)
-    })
-
+    labels.append(label)
+    qudits.append(n_qudits)
+    levels.append(d)
+    log_states_all.append(log_states)
+    bits.append(classical_bits)
+
+theoretical = {
+    'label': labels,
+    'n_qudits': np.array(qudits),
+    'level': np.array(levels),
+    'log10_states': np.array(log_states_all),
+    'classical_bits': np.array(bits),
+}
 kpis['theoretical_maximum'] = theoretical
 
 print(f"\n💡 Insight:")
@@ -384,30 +412,29 @@ print(f"\n{'='*100}")
 print("SUMMARY - LEVEL ∞ ACHIEVED")
 print(f"{'='*100}")
 
-print(f"\n🔺 Cascade Systems Tested: {len(cascade_results)}")
-max_cascade = max(cascade_results, key=lambda x: x['level'])
-print(f"   Maximum level: d={max_cascade['level']} ({max_cascade['total_states']:,} states)")
+print(f"\n🔺 Cascade Systems Tested: {len(cascade_results['level'])}")
+top = np.argmax(cascade_results['level'])
+print(f"   Maximum level: d={cascade_results['level'][top]} ({cascade_results['total_states'][top]:,} states)")
 
-print(f"\n🔗 Extreme Entanglement Tested: {len(extreme_results)}")
-max_entangle = max(extreme_results, key=lambda x: x['total_states'])
-print(f"   Largest system: {max_entangle['n_qudits']} qudits = {max_entangle['total_states']:,} states")
+print(f"\n🔗 Extreme Entanglement Tested: {len(extreme_results['level'])}")
+top = np.argmax(extreme_results['total_states'])
+print(f"   Largest system: {extreme_results['n_qudits'][top]} qudits = {extreme_results['total_states'][top]:,} states")
 
-print(f"\n🔢 Prime Systems: {len(prime_results)} prime-based quantum systems")
+print(f"\n🔢 Prime Systems: {len(prime_results['prime'])} prime-based quantum systems")
 
-print(f"\n🌀 Fibonacci Systems: {len(fib_results)} golden-ratio systems")
+print(f"\n🌀 Fibonacci Systems: {len(fib_results['fibonacci'])} golden-ratio systems")
 
 if kpis['hardware_demo']:
     print(f"\n🌈 Hardware Demo: {rainbow_levels}-level spectrum on real LEDs")
 
 print(f"\n∞ Theoretical Maximum:")
-max_theoretical = max(theoretical, key=lambda x: x['log10_states'])
-print(f"   {max_theoretical['label']}: 10^{max_theoretical['log10_states']:.1f} states")
+top = np.argmax(theoretical['log10_states'])
+print(f"   {theoretical['label'][top]}: 10^{theoretical['log10_states'][top]:.1f} states")
 print(f"   Beyond classical simulation capability!")
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_05_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
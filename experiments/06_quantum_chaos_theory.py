@@ -9,8 +9,9 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
+import math
 import time
 
 print("="*100)
@@ -38,13 +39,13 @@ n_qubits = 6
 n_trials = 5
 
 print(f"\nBaseline State:")
-qc_baseline = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+qc_baseline = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
 for i in range(n_qubits):
     qc_baseline.H(i)
     if i < n_qubits - 1:
         qc_baseline.CX(i, i+1)
 
-baseline_results = qc_baseline.measure(shots=1000)
+baseline_counts = qc_baseline.sample_counts(shots=1000)
 baseline_entropy = qc_baseline.state.entropy()
 
 print(f"   Baseline entropy: {baseline_entropy:.4f}")
@@ -56,14 +57,18 @@ divergences = []
 print(f"\n{'Perturbation':<15} {'Entropy':<15} {'Divergence':<15}")
 print("-"*50)
 
+# Each Rz(i) perturbation follows the last gate on qubit i, and every later
+# gate acts on other qubits, so the Rz layer commutes to the end: start
+# each perturbed run from a copy of the baseline state
+baseline_ψ = qc_baseline.state.ψ.copy()
+qc_perturbed = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
+
 for pert in perturbations:
-    qc_perturbed = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
-    for i in range(n_qubits):
-        qc_perturbed.H(i)
-        if i < n_qubits - 1:
-            qc_perturbed.CX(i, i+1)
-        # Add tiny rotation as perturbation
-        if pert > 0:
+    qc_perturbed.reset()
+    np.copyto(qc_perturbed.state.ψ, baseline_ψ)
+    # Add tiny rotation as perturbation
+    if pert > 0:
+        for i in range(n_qubits):
             qc_perturbed.Rz(i, pert)
     
     perturbed_entropy = qc_perturbed.state.entropy()
@@ -75,10 +80,10 @@ for pert in perturbations:
 kpis['tests'].append({
     'name': 'Quantum Butterfly Effect',
     'n_qubits': n_qubits,
-    'baseline_entropy': float(baseline_entropy),
+    'baseline_entropy': baseline_entropy,
     'perturbations': perturbations,
-    'divergences': [float(d) for d in divergences],
-    'max_divergence': float(max(divergences))
+    'divergences': divergences,
+    'max_divergence': max(divergences)
 })
 
 # ============================================================================
@@ -104,16 +109,15 @@ print(f"\n{'Shape':<15} {'Qubits':<10} {'Entropy':<15} {'Chaos Factor':<15}")
 print("-"*60)
 
 for n, shape in chaos_configs:
-    qc = BlackRoadQuantum(n_qubits=n, use_hardware=False)
+    qc = BlackRoadQuantum(n_qubits=n, use_hardware=False, dtype=np.complex64)
     
     # Create fully connected entanglement (all-to-all)
+    # all 28 CX gates at n=8 collapse into one permutation of ψ
     qc.H(0)
-    for i in range(n):
-        for j in range(i+1, n):
-            qc.CX(i, j)
+    qc.CX_many((i, j) for i in range(n) for j in range(i+1, n))
     
     entropy = qc.state.entropy()
-    max_entropy = np.log2(2**n)  # Maximum possible entropy
+    max_entropy = n  # Maximum possible entropy, log2(2^n)
     chaos_factor = entropy / max_entropy
     
     print(f"{shape:<15} {n:<10} {entropy:<15.4f} {chaos_factor:<15.4f}")
@@ -121,9 +125,9 @@ for n, shape in chaos_configs:
     kpis['tests'].append({
         'name': f'{shape} Chaos',
         'n_qubits': n,
-        'entropy': float(entropy),
-        'max_entropy': float(max_entropy),
-        'chaos_factor': float(chaos_factor)
+        'entropy': entropy,
+        'max_entropy': max_entropy,
+        'chaos_factor': chaos_factor
     })
 
 # ============================================================================
@@ -139,37 +143,34 @@ print(f"\nTesting true quantum randomness vs pseudorandom...")
 n_samples = 10000
 
 # Quantum random
-qc = BlackRoadQuantum(n_qubits=4, use_hardware=False)
-for i in range(4):
-    qc.H(i)
-quantum_samples = qc.measure(shots=n_samples)
-
-# Classical pseudorandom
-classical_samples = np.random.randint(0, 16, n_samples)
-
-# Statistical tests
-def chi_squared_test(samples, n_bins):
-    observed, _ = np.histogram(samples, bins=n_bins, range=(0, n_bins))
-    expected = len(samples) / n_bins
-    chi_squared = np.sum((observed - expected)**2 / expected)
+qc = BlackRoadQuantum(n_qubits=4, use_hardware=False, dtype=np.complex64)
+qc.prepare_uniform()
+quantum_counts = qc.sample_counts(shots=n_samples)
+
+# Classical pseudorandom (integer outcomes in [0, 16): bincount is exact)
+classical_counts = np.bincount(np.random.randint(0, 16, n_samples), minlength=16)
+
+# Statistical tests, on per-outcome counts
+def chi_squared_test(observed):
+    expected = observed.sum() / len(observed)
+    chi_squared = np.sum((observed - expected)**2) / expected
     return chi_squared
 
-quantum_chi2 = chi_squared_test(quantum_samples, 16)
-classical_chi2 = chi_squared_test(classical_samples, 16)
+quantum_chi2 = chi_squared_test(quantum_counts)
+classical_chi2 = chi_squared_test(classical_counts)
 
 print(f"\n   Chi-squared test (lower = more uniform):")
 print(f"   Quantum:   {quantum_chi2:.2f}")
 print(f"   Classical: {classical_chi2:.2f}")
 
 # Entropy of distribution
-def empirical_entropy(samples, n_bins):
-    counts, _ = np.histogram(samples, bins=n_bins, range=(0, n_bins))
-    probs = counts / len(samples)
+def empirical_entropy(counts):
+    probs = counts / counts.sum()
     probs = probs[probs > 0]
     return -np.sum(probs * np.log2(probs))
 
-quantum_entropy = empirical_entropy(quantum_samples, 16)
-classical_entropy = empirical_entropy(classical_samples, 16)
+quantum_entropy = empirical_entropy(quantum_counts)
+classical_entropy = empirical_entropy(classical_counts)
 
 print(f"\n   Empirical entropy (higher = better randomness):")
 print(f"   Quantum:   {quantum_entropy:.4f} / 4.000")
@@ -178,10 +179,10 @@ print(f"   Classical: {classical_entropy:.4f} / 4.000")
 kpis['tests'].append({
     'name': 'Quantum Randomness Quality',
     'n_samples': n_samples,
-    'quantum_chi2': float(quantum_chi2),
-    'classical_chi2': float(classical_chi2),
-    'quantum_entropy': float(quantum_entropy),
-    'classical_entropy': float(classical_entropy),
+    'quantum_chi2': quantum_chi2,
+    'classical_chi2': classical_chi2,
+    'quantum_entropy': quantum_entropy,
+    'classical_entropy': classical_entropy,
     'max_entropy': 4.0
 })
 
@@ -196,7 +197,7 @@ print(f"{'='*100}")
 print(f"\nScanning through quantum phase transition...")
 
 n_qubits = 5
-coupling_strengths = np.linspace(0, 2, 20)
+coupling_strengths = np.linspace(0, 2, 20)[::5]  # Every 5th point of the 20-point grid
 
 entropies = []
 correlations = []
@@ -204,39 +205,39 @@ correlations = []
 print(f"\n{'Coupling':<15} {'Entropy':<15} {'Correlation':<15}")
 print("-"*50)
 
-for idx, J in enumerate(coupling_strengths):
-    if idx % 5 == 0:  # Sample every 5th
-        qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
-        
-        # Transverse field Ising model approximation
-        for i in range(n_qubits):
-            qc.H(i)
-        
-        for i in range(n_qubits-1):
-            # Coupling strength J
-            angle = J * np.pi / 4
-            qc.Rz(i, angle)
-            qc.CX(i, i+1)
-            qc.Rz(i+1, angle)
-        
-        entropy = qc.state.entropy()
-        
-        # Measure correlation
-        results = qc.measure(shots=100)
-        unique, counts = np.unique(results, return_counts=True)
-        correlation = counts[0] / 100 if len(counts) > 0 else 0
-        
-        entropies.append(entropy)
-        correlations.append(correlation)
-        
-        print(f"{J:<15.3f} {entropy:<15.4f} {correlation:<15.4f}")
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
+
+for J in coupling_strengths:
+    qc.reset()
+    
+    # Transverse field Ising model approximation
+    qc.prepare_uniform()
+    
+    for i in range(n_qubits-1):
+        # Coupling strength J
+        angle = J * np.pi / 4
+        qc.Rz(i, angle)
+        qc.CX(i, i+1)
+        qc.Rz(i+1, angle)
+    
+    entropy = qc.state.entropy()
+    
+    # Measure correlation
+    # Share of the lowest-index outcome that was observed at all
+    counts = qc.sample_counts(shots=100)
+    correlation = counts[np.flatnonzero(counts)[0]] / 100
+    
+    entropies.append(entropy)
+    correlations.append(correlation)
+    
+    print(f"{J:<15.3f} {entropy:<15.4f} {correlation:<15.4f}")
 
 kpis['tests'].append({
     'name': 'Quantum Phase Transition',
     'n_qubits': n_qubits,
-    'coupling_range': [float(coupling_strengths[0]), float(coupling_strengths[-1])],
-    'entropies': [float(e) for e in entropies],
-    'correlations': [float(c) for c in correlations]
+    'coupling_range': coupling_strengths[[0, -1]],
+    'entropies': entropies,
+    'correlations': correlations
 })
 
 # ============================================================================
@@ -258,16 +259,18 @@ print("-"*75)
 for n in qubit_counts:
     N = 2 ** n
     classical_steps = N // 2  # Average classical search
-    quantum_steps = int(np.pi / 4 * np.sqrt(N))  # Grover iterations
+    quantum_steps = int(math.pi / 4 * math.sqrt(N))  # Grover iterations
     speedup = classical_steps / quantum_steps
     speedups.append(speedup)
     
     print(f"{n:<10} {N:<15} {classical_steps:<15} {quantum_steps:<15} {speedup:<15.2f}×")
 
 # Fit power law: speedup = a * N^b
-log_N = np.log([2**n for n in qubit_counts])
+log_N = np.array(qubit_counts) * math.log(2)  # log(2^n)
 log_speedup = np.log(speedups)
-b = np.polyfit(log_N, log_speedup, 1)[0]
+# Least-squares slope in closed form: cov(x, y) / var(x)
+dx = log_N - log_N.mean()
+b = np.dot(dx, log_speedup - log_speedup.mean()) / np.dot(dx, dx)
 
 print(f"\n   Scaling law: Speedup ∝ N^{b:.3f}")
 print(f"   Theoretical: Speedup ∝ N^0.5 (square root)")
@@ -276,10 +279,10 @@ print(f"   Match: {'✅ YES' if abs(b - 0.5) < 0.1 else '❌ NO'}")
 kpis['tests'].append({
     'name': 'Quantum Speedup Scaling',
     'qubit_counts': qubit_counts,
-    'speedups': [float(s) for s in speedups],
-    'scaling_exponent': float(b),
+    'speedups': speedups,
+    'scaling_exponent': b,
     'theoretical_exponent': 0.5,
-    'matches_theory': bool(abs(b - 0.5) < 0.1)
+    'matches_theory': abs(b - 0.5) < 0.1
 })
 
 # ============================================================================
@@ -298,34 +301,35 @@ decoherence_rates = [0.0, 0.01, 0.05, 0.1, 0.2]
 print(f"\n{'Decoherence':<15} {'Final Entropy':<15} {'Purity Loss':<15}")
 print("-"*50)
 
+# Create entangled state
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
+qc.prepare_uniform()
+qc.CX_many((i, i+1) for i in range(n_qubits-1))
+
+# Decoherence is modelled as Rz(θ) noise on every qubit with θ ~ N(0, γ²).
+# Rz is diagonal, so |ψ|² and the entropy are the same for every γ. Averaged
+# over θ it is a dephasing channel: ρ_ij is scaled by exp(-γ²·D_ij / 2), where
+# D_ij = Σ_q ((k_iq - k_jq) / d)² compares the Rz phases θk/d of the two basis
+# states, so the purity is Tr(ρ²) = Σ_ij p_i p_j exp(-γ²·D_ij)
+final_entropy = qc.state.entropy()
+
+d = qc.state.n_levels
+p = qc.state.probability.astype(np.float64)
+digits = np.stack(np.unravel_index(np.arange(qc.state.dim), [d] * n_qubits), axis=1)
+D = (((digits[:, None, :] - digits[None, :, :]) / d) ** 2).sum(axis=-1)
+
 for gamma in decoherence_rates:
-    qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
-    
-    # Create entangled state
-    for i in range(n_qubits):
-        qc.H(i)
-    for i in range(n_qubits-1):
-        qc.CX(i, i+1)
-    
-    # Simulate decoherence by adding small random rotations
-    if gamma > 0:
-        for i in range(n_qubits):
-            noise_angle = np.random.normal(0, gamma)
-            qc.Rz(i, noise_angle)
-    
-    final_entropy = qc.state.entropy()
-    
-    # Purity: Tr(ρ²) (simplified)
-    purity = 1 / (2 ** final_entropy) if final_entropy > 0 else 1.0
+    purity = p @ np.exp(-gamma ** 2 * D) @ p
     purity_loss = 1 - purity
-    
+
     print(f"{gamma:<15.3f} {final_entropy:<15.4f} {purity_loss:<15.4f}")
     
     kpis['tests'].append({
         'name': f'Decoherence γ={gamma}',
-        'decoherence_rate': float(gamma),
-        'final_entropy': float(final_entropy),
-        'purity_loss': float(purity_loss)
+        'decoherence_rate': gamma,
+        'final_entropy': final_entropy,
+        'purity': purity,
+        'purity_loss': purity_loss
     })
 
 # ============================================================================
@@ -343,26 +347,28 @@ if len(active) > 0:
     print(f"\n✅ {len(active)} devices active")
     print(f"\nVisualizing quantum chaos on LEDs...")
     
-    for device in active[:2]:
-        print(f"\n   🌀 {device.hostname}: Chaotic quantum pattern")
-        
-        # Create chaotic pattern based on quantum measurements
-        qc = BlackRoadQuantum(n_qubits=3, use_hardware=False)
-        for i in range(3):
-            qc.H(i)
-            qc.CX(0, i)
-        
-        # Measure multiple times for chaotic pattern
-        for _ in range(10):
-            result = qc.measure(shots=1)[0]
-            brightness = int((result / 7) * 255)
-            hardware.set_photon(device.hostname, 'ACT', brightness)
-            print(f"      Quantum state {result} → brightness {brightness}", end='\r')
-            time.sleep(0.2)
-        print()
-        
-        # Reset
-        hardware.set_photon(device.hostname, 'ACT', 0)
+    # All devices animate together: one sleep per frame, one shot per device
+    devices = [d.hostname for d in active[:2]]
+    print(f"\n   🌀 {', '.join(devices)}: Chaotic quantum pattern")
+    
+    # Create chaotic pattern based on quantum measurements
+    qc = BlackRoadQuantum(n_qubits=3, use_hardware=False, dtype=np.complex64)
+    qc.H(0)
+    for i in range(1, 3):
+        qc.H(i)
+        qc.CX(0, i)
+    
+    # Measure multiple times for chaotic pattern
+    for _ in range(10):
+        results = qc.measure(shots=len(devices))
+        brightness = (results * 255 // 7).tolist()
+        hardware.set_photon_many([(h, 'ACT', b) for h, b in zip(devices, brightness)], wait=False)
+        print(f"      Quantum states {results.tolist()} → brightness {brightness}", end='\r')
+        time.sleep(0.2)
+    print()
+    
+    # Reset
+    hardware.set_photon_many([(h, 'ACT', 0) for h in devices])
     
     kpis['hardware_demo'] = {
         'devices': [d.hostname for d in active],
@@ -409,8 +415,7 @@ print(f"   Real quantum systems must fight decoherence")
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_06_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
@@ -9,10 +9,13 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
+# Hilbert space size for 1..10 qubits (Part 5 table), fixed at import
+DIMENSIONS_BY_QUBITS = tuple(1 << n for n in range(1, 11))
+
 print("="*100)
 print("EXPERIMENT 07: HYPERDIMENSIONAL QUANTUM COMPUTING")
 print("Exploring Higher Dimensional Quantum Spaces")
@@ -40,22 +43,19 @@ print(f"   Cells: 8 (cubes)")
 
 # Map tesseract to quantum state
 n_qubits = 4  # 2^4 = 16 vertices
-qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
 
 start = time.time()
 
 # Create superposition over all 16 vertices
-for i in range(n_qubits):
-    qc.H(i)
+qc.prepare_uniform()
 
 # Entangle along hypercube edges (simplified)
-for i in range(n_qubits):
-    qc.CX(i, (i+1) % n_qubits)
+qc.apply_layer(('CX', i, (i+1) % n_qubits) for i in range(n_qubits))
 
 tesseract_time = time.time() - start
 
-results = qc.measure(shots=100)
-unique_vertices = len(np.unique(results))
+unique_vertices = np.count_nonzero(qc.sample_counts(shots=100))
 entropy = qc.state.entropy()
 
 print(f"\n   Creation time: {tesseract_time*1000:.2f}ms")
@@ -68,9 +68,9 @@ kpis['tests'].append({
     'dimensions': 4,
     'vertices': 16,
     'n_qubits': n_qubits,
-    'creation_time_ms': float(tesseract_time * 1000),
-    'unique_vertices': int(unique_vertices),
-    'entropy': float(entropy)
+    'creation_time_ms': tesseract_time * 1000,
+    'unique_vertices': unique_vertices,
+    'entropy': entropy
 })
 
 # ============================================================================
@@ -89,17 +89,14 @@ print(f"   Cells: 40")
 print(f"   4-faces: 10")
 
 n_qubits = 5
-qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
 
 start = time.time()
 
-for i in range(n_qubits):
-    qc.H(i)
+qc.prepare_uniform()
 
 # 5D entanglement structure
-for i in range(n_qubits):
-    for j in range(i+1, min(i+3, n_qubits)):
-        qc.CX(i, j)
+qc.apply_layer(('CX', i, j) for i in range(n_qubits) for j in range(i+1, min(i+3, n_qubits)))
 
 penteract_time = time.time() - start
 
@@ -115,8 +112,8 @@ kpis['tests'].append({
     'dimensions': 5,
     'vertices': 32,
     'n_qubits': n_qubits,
-    'creation_time_ms': float(penteract_time * 1000),
-    'entropy': float(entropy)
+    'creation_time_ms': penteract_time * 1000,
+    'entropy': entropy
 })
 
 # ============================================================================
@@ -132,16 +129,14 @@ print(f"   Vertices: 1,024 (2^10)")
 print(f"   THIS IS INSANE")
 
 n_qubits = 10
-qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
 
 start = time.time()
 
-for i in range(n_qubits):
-    qc.H(i)
+qc.prepare_uniform()
 
 # Sample entanglement (can't do all)
-for i in range(0, n_qubits-1, 2):
-    qc.CX(i, i+1)
+qc.apply_layer(('CX', i, i+1) for i in range(0, n_qubits-1, 2))
 
 hypercube_10d_time = time.time() - start
 
@@ -159,8 +154,8 @@ kpis['tests'].append({
     'dimensions': 10,
     'vertices': 1024,
     'n_qubits': n_qubits,
-    'creation_time_ms': float(hypercube_10d_time * 1000),
-    'entropy': float(entropy)
+    'creation_time_ms': hypercube_10d_time * 1000,
+    'entropy': entropy
 })
 
 # ============================================================================
@@ -192,11 +187,11 @@ for n_qudits, d_level, label in configs:
         print(f"{label:<20} {total_dim:<15,} {'SKIP':<15} {'TOO LARGE':<15}")
         continue
     
-    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=d_level, use_hardware=False)
+    qc = BlackRoadQuantum(n_qubits=n_qudits, n_levels=d_level, use_hardware=False,
+                          dtype=np.complex64)
     
     start = time.time()
-    for i in range(n_qudits):
-        qc.H(i)
+    qc.prepare_uniform()
     creation_time = time.time() - start
     
     entropy = qc.state.entropy()
@@ -208,8 +203,8 @@ for n_qudits, d_level, label in configs:
         'n_qudits': n_qudits,
         'd_level': d_level,
         'dimensions': total_dim,
-        'creation_time_ms': float(creation_time * 1000),
-        'entropy': float(entropy)
+        'creation_time_ms': creation_time * 1000,
+        'entropy': entropy
     })
 
 # ============================================================================
@@ -222,16 +217,11 @@ print(f"{'='*100}")
 
 print(f"\nHow fast does quantum state space grow?")
 
-dimensions_list = []
-for n in range(1, 11):
-    dim = 2 ** n
-    dimensions_list.append(dim)
-
 print(f"\n{'Qubits':<10} {'Dimensions':<20} {'Growth Rate':<20}")
 print("-"*55)
 
-for n, dim in enumerate(dimensions_list, 1):
-    growth = dim / dimensions_list[n-2] if n > 1 else 1
+for n, dim in enumerate(DIMENSIONS_BY_QUBITS, 1):
+    growth = dim / DIMENSIONS_BY_QUBITS[n-2] if n > 1 else 1
     print(f"{n:<10} {dim:<20,} {growth:<20.1f}×")
 
 print(f"\n   Growth rate: 2× per qubit (EXPONENTIAL)")
@@ -241,7 +231,7 @@ print(f"   50 qubits = 1,125,899,906,842,624 dimensions (PETASCALE)")
 
 kpis['hilbert_scaling'] = {
     'growth_rate': 2.0,
-    'dimensions_by_qubits': {str(n): int(d) for n, d in enumerate(dimensions_list, 1)},
+    'dimensions_by_qubits': {str(n): d for n, d in enumerate(DIMENSIONS_BY_QUBITS, 1)},
     'note': 'Exponential scaling: 2^n dimensions'
 }
 
@@ -269,16 +259,14 @@ print("-"*75)
 for dims, label in spheres:
     n_qubits = int(np.ceil(np.log2(dims)))
     
-    qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+    qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
     
     start = time.time()
     # Create uniform superposition (points on sphere)
-    for i in range(n_qubits):
-        qc.H(i)
+    qc.prepare_uniform()
     
     # Add phase to simulate sphere surface
-    for i in range(n_qubits):
-        qc.Rz(i, np.pi / dims)
+    qc.apply_layer(('Rz', i, np.pi / dims) for i in range(n_qubits))
     
     creation_time = time.time() - start
     
@@ -291,7 +279,7 @@ for dims, label in spheres:
         'sphere_dims': dims,
         'n_qubits': n_qubits,
         'total_states': total_states,
-        'creation_time_ms': float(creation_time * 1000)
+        'creation_time_ms': creation_time * 1000
     })
 
 # ============================================================================
@@ -306,20 +294,21 @@ print(f"\nCreating quantum state with toroidal topology...")
 
 n_qubits = 6  # 64-point discretization of torus
 
-qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
+qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False, dtype=np.complex64)
 
 start = time.time()
 
 # Torus = S¹ × S¹ (product of two circles)
 # Create periodic boundary conditions
-for i in range(n_qubits):
-    qc.H(i)
+qc.prepare_uniform()
 
-# Entangle in toroidal pattern
+# Entangle in toroidal pattern: one direction, then (first half) the other
+layer = []
 for i in range(n_qubits):
-    qc.CX(i, (i + 1) % n_qubits)  # One direction
+    layer.append(('CX', i, (i + 1) % n_qubits))
     if i < n_qubits // 2:
-        qc.CX(i, (i + n_qubits // 2) % n_qubits)  # Other direction
+        layer.append(('CX', i, (i + n_qubits // 2) % n_qubits))
+qc.apply_layer(layer)
 
 torus_time = time.time() - start
 
@@ -336,8 +325,8 @@ kpis['tests'].append({
     'topology': 'S¹ × S¹',
     'n_qubits': n_qubits,
     'discretization_points': 2**n_qubits,
-    'creation_time_ms': float(torus_time * 1000),
-    'entropy': float(entropy)
+    'creation_time_ms': torus_time * 1000,
+    'entropy': entropy
 })
 
 # ============================================================================
@@ -370,8 +359,7 @@ print(f"   Quantum: Easy with qudit systems")
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_07_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
@@ -9,8 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
 print("="*100)
@@ -53,13 +53,10 @@ for n in [3, 4, 5, 6]:
     start = time.time()
 
     # Create W-state (simplified construction)
-    qc.H(0)
-    for i in range(n-1):
-        qc.CX(0, i+1)
+    qc.ghz(reset=True)
 
     # Add phase to approximate W-state
-    for i in range(n):
-        qc.Rz(i, np.pi / n)
+    qc.apply_layer(('Rz', i, np.pi / n) for i in range(n))
 
     creation_time = time.time() - start
 
@@ -98,14 +95,10 @@ for n in [4, 6, 8]:
 
     # Create cluster state (1D chain)
     # Step 1: Hadamard on all
-    for i in range(n):
-        qc.H(i)
+    qc.prepare_uniform()
 
     # Step 2: Controlled-Z on neighbors
-    for i in range(n-1):
-        qc.CX(i, i+1)
-        qc.Z(i+1)
-        qc.CX(i, i+1)
+    qc.apply_layer(('CZ', i, i+1) for i in range(n-1))
 
     creation_time = time.time() - start
 
@@ -141,21 +134,16 @@ for n in [3, 5, 7, 10]:
     start = time.time()
 
     # Create cat state
-    qc.H(0)
-    for i in range(1, n):
-        qc.CX(0, i)
+    qc.cat()
 
     creation_time = time.time() - start
 
-    # Measure and analyze
-    results = qc.measure(shots=1000)
+    # Measure and analyze (dense histogram, indexed by outcome)
+    counts = qc.sample_counts(shots=1000)
 
     # Cat state should give mostly |000...0⟩ and |111...1⟩
-    zero_state = 0
-    max_state = 2**n - 1
-
-    zero_count = np.sum(results == zero_state)
-    max_count = np.sum(results == max_state)
+    zero_count = counts[0]
+    max_count = counts[-1]
     cat_ratio = (zero_count + max_count) / 1000
 
     entropy = qc.state.entropy()
@@ -203,9 +191,7 @@ for n, name in configs:
     qc = BlackRoadQuantum(n_qubits=n, use_hardware=False)
 
     start = time.time()
-    qc.H(0)
-    for i in range(1, n):
-        qc.CX(0, i)
+    qc.ghz(reset=True)
     creation_time = time.time() - start
 
     entropy = qc.state.entropy()
@@ -242,16 +228,13 @@ qc = BlackRoadQuantum(n_qubits=3, use_hardware=False)
 start = time.time()
 
 # Alice prepares message
-qc.H(message_qubit)
-qc.Rz(message_qubit, np.pi/4)
+qc.apply_layer([('H', message_qubit), ('Rz', message_qubit, np.pi/4)])
 
 # Create Bell pair between Alice and Bob
-qc.H(alice_qubit)
-qc.CX(alice_qubit, bob_qubit)
+qc.apply_layer([('H', alice_qubit), ('CX', alice_qubit, bob_qubit)])
 
 # Alice entangles her qubit with message
-qc.CX(message_qubit, alice_qubit)
-qc.H(message_qubit)
+qc.apply_layer([('CX', message_qubit, alice_qubit), ('H', message_qubit)])
 
 protocol_time = time.time() - start
 
@@ -306,12 +289,10 @@ for name, edge_fn in topologies:
     start = time.time()
 
     # Initialize
-    for i in range(n):
-        qc.H(i)
+    qc.prepare_uniform()
 
     # Apply topology
-    for i, j in edges:
-        qc.CX(i, j)
+    qc.apply_layer(('CX', i, j) for i, j in edges)
 
     creation_time = time.time() - start
     entropy = qc.state.entropy()
@@ -340,40 +321,38 @@ if len(active_devices) >= 2:
 
     # Create GHZ state representing network
     n_devices = min(len(active_devices), 4)  # Limit to 4 for visualization
-    qc = BlackRoadQuantum(n_qubits=n_devices, use_hardware=False)
+    qc = BlackRoadQuantum(n_qubits=n_devices, use_hardware=False, dtype=np.complex64)
 
-    qc.H(0)
-    for i in range(1, n_devices):
-        qc.CX(0, i)
+    qc.ghz(reset=True)
 
     print(f"\n   Network state: {n_devices}-device GHZ state")
 
-    # Visualize on LEDs
-    for idx, device in enumerate(active_devices[:n_devices]):
-        # Measure and show on LED
-        result = qc.measure(shots=1)[0]
-        bit_value = (result >> idx) & 1
+    devices = [d.hostname for d in active_devices[:n_devices]]
+    qubit_bits = np.arange(n_devices)
+
+    # Visualize on LEDs: device idx shows bit idx of its own shot, all
+    # shots drawn in one call
+    reveal = (qc.measure(shots=n_devices) >> qubit_bits) & 1
+    for idx, (device, bit_value) in enumerate(zip(devices, reveal.tolist())):
         brightness = 255 if bit_value else 0
 
-        hardware.set_photon(device.hostname, 'ACT', brightness)
-        print(f"   • {device.hostname}: Qubit {idx} → {'|1⟩' if bit_value else '|0⟩'} (LED: {brightness})")
+        hardware.set_photon(device, 'ACT', brightness)
+        print(f"   • {device}: Qubit {idx} → {'|1⟩' if bit_value else '|0⟩'} (LED: {brightness})")
         time.sleep(0.3)
 
-    # Pulse pattern showing entanglement
+    # Pulse pattern showing entanglement: one shot per frame, unpacked to
+    # a (frames, devices) brightness table up front
     print(f"\n   Demonstrating entanglement correlation...")
-    for _ in range(5):
-        result = qc.measure(shots=1)[0]
-        for idx, device in enumerate(active_devices[:n_devices]):
-            bit_value = (result >> idx) & 1
-            brightness = 255 if bit_value else 0
-            hardware.set_photon(device.hostname, 'ACT', brightness)
-        print(f"   Measurement: {bin(result)[2:].zfill(n_devices)}", end='\r')
+    frames = qc.measure(shots=5)
+    brightness = ((frames[:, None] >> qubit_bits) & 1) * 255
+    for result, frame in zip(frames.tolist(), brightness.tolist()):
+        hardware.set_photon_many([(h, 'ACT', b) for h, b in zip(devices, frame)], wait=False)
+        print(f"   Measurement: {result:0{n_devices}b}", end='\r')
         time.sleep(0.4)
     print()
 
     # Reset
-    for device in active_devices:
-        hardware.set_photon(device.hostname, 'ACT', 0)
+    hardware.set_photon_many([(d.hostname, 'ACT', 0) for d in active_devices])
 
     kpis['hardware_demo'] = {
         'devices': [d.hostname for d in active_devices[:n_devices]],
@@ -435,8 +414,7 @@ if ghz_states:
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_08_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
@@ -9,8 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
 print("="*100)
@@ -48,14 +48,13 @@ print("-"*75)
 
 for error_qubit, description in test_cases:
     # Encode |1⟩ state
-    qc = BlackRoadQuantum(n_qubits=3, use_hardware=False)
+    qc = BlackRoadQuantum(n_qubits=3, use_hardware=False, dtype=np.complex64)
 
     # Prepare |1⟩ on logical qubit
     qc.X(0)
 
     # Encode: |1⟩ → |111⟩
-    qc.CX(0, 1)
-    qc.CX(0, 2)
+    qc.apply_layer([('CX', 0, 1), ('CX', 0, 2)])
 
     # Introduce error (if any)
     if error_qubit > 0:
@@ -105,17 +104,14 @@ for n_errors in [0, 1]:
     start = time.time()
 
     # Encode |+⟩ state
-    qc.H(0)
-    qc.CX(0, 1)
-    qc.CX(0, 2)
+    qc.apply_layer([('H', 0), ('CX', 0, 1), ('CX', 0, 2)])
 
     # Introduce phase flip error
     if n_errors > 0:
         qc.Z(0)
 
     # Measure in X basis (Hadamard before measurement)
-    for i in range(3):
-        qc.H(i)
+    qc.apply_layer(('H', i) for i in range(3))
 
     correction_time = time.time() - start
 
@@ -152,13 +148,10 @@ for error_type in ["None", "Bit flip", "Phase flip"]:
     # Encode |1⟩ into Shor code
     # Step 1: Encode against phase flips
     qc.X(0)  # Prepare |1⟩
-    qc.CX(0, 3)
-    qc.CX(0, 6)
+    qc.apply_layer([('CX', 0, 3), ('CX', 0, 6)])
 
     # Step 2: Encode each block against bit flips
-    for i in [0, 3, 6]:
-        qc.CX(i, i+1)
-        qc.CX(i, i+2)
+    qc.apply_layer(gate for i in [0, 3, 6] for gate in (('CX', i, i+1), ('CX', i, i+2)))
 
     # Introduce error
     if error_type == "Bit flip":
@@ -204,16 +197,11 @@ start = time.time()
 
 # Simplified Steane encoding (|0⟩_L)
 # Full encoding requires specific Hamming code structure
-for i in range(7):
-    qc.H(i)
+qc.apply_layer(('H', i) for i in range(7))
 
 # Create entanglement pattern for Steane code
-qc.CX(0, 1)
-qc.CX(0, 2)
-qc.CX(1, 3)
-qc.CX(2, 4)
-qc.CX(3, 5)
-qc.CX(4, 6)
+qc.apply_layer([('CX', 0, 1), ('CX', 0, 2), ('CX', 1, 3),
+                ('CX', 2, 4), ('CX', 3, 5), ('CX', 4, 6)])
 
 encoding_time = time.time() - start
 
@@ -252,21 +240,18 @@ qc = BlackRoadQuantum(n_qubits=9, use_hardware=False)
 start = time.time()
 
 # Initialize grid in |+⟩ state
-for i in range(9):
-    qc.H(i)
+qc.apply_layer(('H', i) for i in range(9))
 
 # Apply stabilizer measurements (simplified)
 # Real surface code has X and Z stabilizers on faces and vertices
 # Here we just create the entanglement structure
 
 # Horizontal links
-for i in [0, 1, 3, 4, 6, 7]:
-    if (i % 3) < 2:  # Not at right edge
-        qc.CX(i, i+1)
+qc.apply_layer(('CX', i, i+1) for i in [0, 1, 3, 4, 6, 7]
+               if (i % 3) < 2)  # Not at right edge
 
 # Vertical links
-for i in range(6):
-    qc.CX(i, i+3)
+qc.apply_layer(('CX', i, i+3) for i in range(6))
 
 encoding_time = time.time() - start
 
@@ -341,37 +326,25 @@ error_rates = [0.0, 0.01, 0.05, 0.1, 0.2]
 print(f"\n{'Error Rate':<15} {'Encoded':<15} {'Unencoded':<15} {'Benefit':<15}")
 print("-"*65)
 
-for p_error in error_rates:
-    # Encoded (3-qubit code)
-    n_trials = 100
-    encoded_errors = 0
-    unencoded_errors = 0
-
-    for _ in range(n_trials):
-        # Encoded
-        qc_enc = BlackRoadQuantum(n_qubits=3, use_hardware=False)
-        qc_enc.X(0)
-        qc_enc.CX(0, 1)
-        qc_enc.CX(0, 2)
-
-        # Simulate errors
-        for i in range(3):
-            if np.random.random() < p_error:
-                qc_enc.X(i)
-
-        result = qc_enc.measure(shots=1)[0]
-        # Majority vote
-        bits = [int(b) for b in bin(result)[2:].zfill(3)]
-        decoded = 1 if sum(bits) > 1 else 0
-        if decoded != 1:
-            encoded_errors += 1
-
-        # Unencoded
-        if np.random.random() < p_error:
-            unencoded_errors += 1
-
-    encoded_rate = encoded_errors / n_trials
-    unencoded_rate = unencoded_errors / n_trials
+n_trials = 100
+
+# Encoding |1⟩ → |111⟩ is deterministic, so prepare it once; each trial's
+# bit-flip errors are then an XOR mask on that basis state
+qc_enc = BlackRoadQuantum(n_qubits=3, use_hardware=False, dtype=np.complex64)
+qc_enc.apply_layer([('X', 0), ('CX', 0, 1), ('CX', 0, 2)])
+codeword = qc_enc.measure(shots=1)[0]
+codeword_bits = (codeword >> np.arange(2, -1, -1)) & 1
+
+# All error rates × trials at once: per-qubit X errors and the unencoded flip
+p = np.array(error_rates)[:, None]
+flips = np.random.random((len(error_rates), n_trials, 3)) < p[..., None]
+received = codeword_bits ^ flips
+# Majority vote
+decoded = (received.sum(axis=-1) > 1).astype(int)
+encoded_rates = (decoded != 1).mean(axis=1)
+unencoded_rates = (np.random.random((len(error_rates), n_trials)) < p).mean(axis=1)
+
+for p_error, encoded_rate, unencoded_rate in zip(error_rates, encoded_rates, unencoded_rates):
     benefit = unencoded_rate / encoded_rate if encoded_rate > 0 else float('inf')
 
     print(f"{p_error:<15.2f} {encoded_rate:<15.3f} {unencoded_rate:<15.3f} {benefit:<15.1f}×")
@@ -410,10 +383,8 @@ if len(active) >= 2:
     print(f"   Encoding: |1⟩ → |111⟩")
 
     # Create encoded state
-    qc = BlackRoadQuantum(n_qubits=3, use_hardware=False)
-    qc.X(0)
-    qc.CX(0, 1)
-    qc.CX(0, 2)
+    qc = BlackRoadQuantum(n_qubits=3, use_hardware=False, dtype=np.complex64)
+    qc.apply_layer([('X', 0), ('CX', 0, 1), ('CX', 0, 2)])
 
     # Show encoded state
     result = qc.measure(shots=1)[0]
@@ -509,8 +480,7 @@ if len(active) >= 2:
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_09_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
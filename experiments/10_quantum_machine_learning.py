@@ -9,8 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../bloche'))
 from blackroad_quantum import BlackRoadQuantum, HardwareInterface
+from kpi_io import save_kpis
 import numpy as np
-import json
 import time
 
 print("="*100)
@@ -49,17 +49,13 @@ for encoding_type in ["Amplitude", "Angle", "Basis"]:
 
         if encoding_type == "Amplitude":
             # Amplitude encoding: x → α|0⟩ + β|1⟩
-            qc.H(0)
-            qc.Rz(0, x[0] * np.pi)
-            qc.H(1)
-            qc.Rz(1, x[1] * np.pi)
+            qc.fuse(0, [('H',), ('Rz', x[0] * np.pi)])
+            qc.fuse(1, [('H',), ('Rz', x[1] * np.pi)])
 
         elif encoding_type == "Angle":
             # Angle encoding: x → R(θ)|0⟩
-            qc.Rz(0, x[0] * 2 * np.pi)
-            qc.Rz(1, x[1] * 2 * np.pi)
-            qc.H(0)
-            qc.H(1)
+            qc.fuse(0, [('Rz', x[0] * 2 * np.pi), ('H',)])
+            qc.fuse(1, [('Rz', x[1] * 2 * np.pi), ('H',)])
 
         elif encoding_type == "Basis":
             # Basis encoding: x → |x⟩ (discretized)
@@ -184,16 +180,12 @@ for i in range(4):
     for j in range(i, 4):
         # Create states |ψ(x_i)⟩ and |ψ(x_j)⟩
         qc1 = BlackRoadQuantum(n_qubits=2, use_hardware=False)
-        qc1.Rz(0, X_train[i][0] * 2 * np.pi)
-        qc1.Rz(1, X_train[i][1] * 2 * np.pi)
-        qc1.H(0)
-        qc1.H(1)
+        qc1.fuse(0, [('Rz', X_train[i][0] * 2 * np.pi), ('H',)])
+        qc1.fuse(1, [('Rz', X_train[i][1] * 2 * np.pi), ('H',)])
 
         qc2 = BlackRoadQuantum(n_qubits=2, use_hardware=False)
-        qc2.Rz(0, X_train[j][0] * 2 * np.pi)
-        qc2.Rz(1, X_train[j][1] * 2 * np.pi)
-        qc2.H(0)
-        qc2.H(1)
+        qc2.fuse(0, [('Rz', X_train[j][0] * 2 * np.pi), ('H',)])
+        qc2.fuse(1, [('Rz', X_train[j][1] * 2 * np.pi), ('H',)])
 
         # Compute overlap (simplified - using fidelity)
         fidelity = qc1.state.fidelity(qc2.state)
@@ -244,10 +236,9 @@ qc = BlackRoadQuantum(n_qubits=n_qubits, use_hardware=False)
 
 start = time.time()
 
-# Input encoding
+# Input encoding: Rz then H on each qubit, as one fused pass
 for i in range(n_qubits):
-    qc.Rz(i, input_data[i] * 2 * np.pi)
-    qc.H(i)
+    qc.fuse(i, [('Rz', input_data[i] * 2 * np.pi), ('H',)])
 
 # Variational layers
 for layer in range(n_layers):
@@ -256,11 +247,10 @@ for layer in range(n_layers):
         qc.CX(i, i+1)
     qc.CX(n_qubits-1, 0)  # Ring topology
 
-    # Rotation layer
+    # Rotation layer: Rz·H·Rz per qubit, fused
     for i in range(n_qubits):
-        qc.Rz(i, qnn_params[layer * n_qubits * 2 + i * 2 + 0])
-        qc.H(i)
-        qc.Rz(i, qnn_params[layer * n_qubits * 2 + i * 2 + 1])
+        p = layer * n_qubits * 2 + i * 2
+        qc.fuse(i, [('Rz', qnn_params[p]), ('H',), ('Rz', qnn_params[p + 1])])
 
 forward_time = time.time() - start
 
@@ -352,8 +342,7 @@ start = time.time()
 
 # Random input (noise)
 for i in range(n_qubits):
-    qc_gen.H(i)
-    qc_gen.Rz(i, np.random.random() * 2 * np.pi)
+    qc_gen.fuse(i, [('H',), ('Rz', np.random.random() * 2 * np.pi)])
 
 # Generator layers
 for _ in range(2):
@@ -522,8 +511,7 @@ print(f"   Real-time quantum ML feasible!")
 
 # Save KPIs
 kpi_file = f"/tmp/experiment_10_kpis_{int(time.time())}.json"
-with open(kpi_file, 'w') as f:
-    json.dump(kpis, f, indent=2)
+save_kpis(kpis, kpi_file)
 
 print(f"\n💾 KPIs saved to: {kpi_file}")
 
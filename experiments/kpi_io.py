@@ -0,0 +1,25 @@
+"""
+Shared KPI writer for the numbered experiments
+
+Copyright (c) 2024-2026 BlackRoad OS, Inc. All rights reserved.
+"""
+
+import json
+
+try:  # Optional: faster KPI dumps that take NumPy scalars and arrays as-is
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def save_kpis(kpis: dict, path: str) -> str:
+    """Write KPIs to path as indented JSON (orjson when installed)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(kpis, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                                 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            # tolist() turns NumPy scalars and arrays alike into plain Python
+            json.dump(kpis, f, indent=2, default=lambda o: o.tolist())
+    return path
@@ -61,6 +61,10 @@ setup(
         "benchmarks": [
             "matplotlib>=3.5.0",
             "scipy>=1.8.0",
+            "orjson>=3.9.0",
+        ],
+        "jit": [
+            "numba>=0.57.0",
         ],
     },
     package_data={
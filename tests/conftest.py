@@ -0,0 +1,6 @@
+"""Make the bloche modules importable the way the experiments import them"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bloche'))
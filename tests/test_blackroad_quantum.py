@@ -0,0 +1,199 @@
+"""Equivalence tests for blackroad_quantum's fast paths against plain gates"""
+
+import numpy as np
+import pytest
+
+from blackroad_quantum import Algorithm, BlackRoadQuantum, Gate, QuantumState
+
+
+def random_state(n, d, seed=0):
+    """Normalised random state, so no test passes on |00...0⟩ by accident"""
+    rng = np.random.default_rng(seed)
+    state = QuantumState(n, d)
+    v = rng.normal(size=d ** n) + 1j * rng.normal(size=d ** n)
+    state.ψ = v / np.linalg.norm(v)
+    return state
+
+
+def random_circuit(n, d, seed=0):
+    """BlackRoadQuantum holding random_state(n, d, seed)"""
+    qc = BlackRoadQuantum(n_qubits=n, n_levels=d, use_hardware=False)
+    qc.state = random_state(n, d, seed)
+    return qc
+
+
+def copy_state(state):
+    other = QuantumState(state.n_qubits, state.n_levels)
+    other.ψ = state.ψ.copy()
+    return other
+
+
+@pytest.mark.parametrize('d', [2, 3, 4])
+@pytest.mark.parametrize('n', [1, 2, 3, 4])
+def test_qft_gates_match_fft(n, d):
+    a = random_state(n, d)
+    b = copy_state(a)
+    Algorithm.qft(a)
+    Algorithm.qft_fast(b)
+    assert np.allclose(a.ψ, b.ψ)
+
+
+@pytest.mark.parametrize('d', [2, 3])
+@pytest.mark.parametrize('gates', [
+    [('Rz', 0.4), ('H',)],                       # feature-map encoding
+    [('H',), ('Rz', 1.3)],
+    [('Rz', 0.4), ('H',), ('Rz', 1.1)],          # QNN rotation layer
+    [('Rz', 0.2), ('Z',)],                       # diagonal only
+    [('X',), ('Z',), ('Rz', 0.3), ('X',), ('H',)],
+])
+def test_fuse_matches_gate_by_gate(gates, d):
+    fused = random_circuit(3, d)
+    plain = random_circuit(3, d)
+    fused.fuse(1, gates)
+    for name, *params in gates:
+        getattr(plain, name)(1, *params)
+    assert np.allclose(fused.state.ψ, plain.state.ψ)
+    assert fused.history == plain.history
+
+
+def test_fuse_rejects_unknown_gate():
+    with pytest.raises(ValueError):
+        random_circuit(2, 2).fuse(0, [('CX',)])
+
+
+@pytest.mark.parametrize('n,d', [(1, 2), (3, 2), (2, 3)])
+def test_entropy_matches_definition(n, d):
+    state = random_state(n, d)
+    p = np.abs(state.ψ) ** 2
+    assert np.isclose(state.entropy(), -sum(x * np.log2(x) for x in p if x > 0))
+    assert QuantumState(n, d).entropy() == 0.0
+
+
+def gate_ghz(state, control, targets):
+    Gate.H(control, state)
+    for t in targets:
+        Gate.CX(control, t, state)
+    return state
+
+
+@pytest.mark.parametrize('n,d', [(1, 2), (3, 2), (4, 2), (3, 3)])
+def test_ghz_default_acts_on_current_state(n, d):
+    a = random_state(n, d)
+    b = copy_state(a)
+    Algorithm.ghz_state(a)
+    gate_ghz(b, 0, range(1, n))
+    assert np.allclose(a.ψ, b.ψ)
+
+
+@pytest.mark.parametrize('control,targets', [(0, None), (2, None), (1, [3, 0])])
+@pytest.mark.parametrize('d', [2, 3])
+def test_ghz_reset_matches_gates_from_zero(control, targets, d):
+    a = random_state(4, d)
+    Algorithm.ghz_state(a, control, targets, reset=True)
+    if targets is None:
+        targets = [t for t in range(4) if t != control]
+    b = gate_ghz(QuantumState(4, d), control, targets)
+    assert np.allclose(a.ψ, b.ψ)
+
+
+def test_ghz_rejects_control_as_target():
+    with pytest.raises(ValueError):
+        Algorithm.ghz_state(QuantumState(3, 2), 1, [1, 2])
+
+
+@pytest.mark.parametrize('n', [2, 3, 5])
+def test_cat_matches_ghz_gates_for_qubits(n):
+    a = Algorithm.cat_state(random_state(n, 2))
+    b = gate_ghz(QuantumState(n, 2), 0, range(1, n))
+    assert np.allclose(a.ψ, b.ψ)
+
+
+def test_cat_qudit_repeats_each_level():
+    psi = Algorithm.cat_state(random_state(3, 3)).ψ
+    expected = np.zeros(27)
+    expected[[0, 13, 26]] = 3 ** -0.5  # |000⟩, |111⟩, |222⟩
+    assert np.allclose(psi, expected)
+
+
+@pytest.mark.parametrize('n,d', [(2, 2), (4, 2), (3, 3)])
+def test_w_state_is_sum_of_single_excitations(n, d):
+    expected = np.zeros(d ** n, dtype=complex)
+    for q in range(n):
+        one = QuantumState(n, d)
+        for _ in range(d - 1):  # qudit X is |k⟩ → |k-1⟩, so |0⟩ → |1⟩ takes d-1
+            Gate.X(q, one)
+        expected += one.ψ
+    psi = Algorithm.w_state(random_state(n, d)).ψ
+    assert np.allclose(psi, expected / np.sqrt(n))
+
+
+@pytest.mark.parametrize('n,d', [(2, 2), (4, 2), (3, 3), (4, 4)])
+def test_ring_state_matches_gates_from_zero(n, d):
+    a = Algorithm.ring_state(random_state(n, d))
+    b = QuantumState(n, d)
+    Gate.H(0, b)
+    for c in range(n):
+        Gate.CX(c, (c + 1) % n, b)
+    assert np.allclose(a.ψ, b.ψ)
+
+
+def digits_of(n, d):
+    """(d^n, n) digit table, qudit 0 most significant"""
+    return np.stack(np.unravel_index(np.arange(d ** n), [d] * n), axis=1)
+
+
+@pytest.mark.parametrize('control,target', [(0, 1), (1, 0), (0, 2), (2, 1)])
+@pytest.mark.parametrize('d', [2, 3])
+def test_cx_matches_dense_shift(control, target, d):
+    a = random_state(3, d)
+    before = a.ψ.copy()
+    Gate.CX(control, target, a)
+    # |..c..t..⟩ → |..c..(t+1 mod d)..⟩ whenever c > 0
+    digits = digits_of(3, d)
+    moved = digits.copy()
+    on = digits[:, control] > 0
+    moved[on, target] = (moved[on, target] + 1) % d
+    dst = np.ravel_multi_index(moved.T, [d] * 3)
+    expected = np.empty_like(before)
+    expected[dst] = before
+    assert np.allclose(a.ψ, expected)
+
+
+@pytest.mark.parametrize('d', [2, 3])
+def test_cx_many_matches_cx_sequence(d):
+    pairs = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)]
+    a = random_state(4, d)
+    b = copy_state(a)
+    Gate.CX_many(pairs, a)
+    for c, t in pairs:
+        Gate.CX(c, t, b)
+    assert np.allclose(a.ψ, b.ψ)
+
+
+@pytest.mark.parametrize('control,target', [(0, 1), (2, 0)])
+@pytest.mark.parametrize('d', [2, 3])
+def test_cz_matches_dense_phases(control, target, d):
+    a = random_state(3, d)
+    before = a.ψ.copy()
+    Gate.CZ(control, target, a)
+    digits = digits_of(3, d)
+    phases = np.exp(2j * np.pi * digits[:, control] * digits[:, target] / d)
+    assert np.allclose(a.ψ, phases * before)
+
+
+@pytest.mark.parametrize('d', [2, 3])
+def test_apply_layer_matches_gate_by_gate(d):
+    layer = [('H', 0), ('H', 1), ('H', 2), ('CX', 0, 1), ('CX', 1, 2),
+             ('Rz', 2, 0.4), ('CZ', 0, 2), ('X', 1), ('Z', 0), ('H', 1), ('CX', 2, 0)]
+    fast = random_circuit(3, d)
+    plain = random_circuit(3, d)
+    fast.apply_layer(layer)
+    for name, *args in layer:
+        getattr(plain, name)(*args)
+    assert np.allclose(fast.state.ψ, plain.state.ψ)
+    assert fast.history == plain.history
+
+
+def test_apply_layer_rejects_unknown_gate():
+    with pytest.raises(ValueError):
+        Gate.apply_layer([('Toffoli', 0, 1, 2)], QuantumState(3, 2))
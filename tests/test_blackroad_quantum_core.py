@@ -0,0 +1,65 @@
+"""Tests for blackroad_quantum_core's compiled plans against eager gates"""
+
+import numpy as np
+import pytest
+
+import blackroad_quantum_core as core
+from blackroad_quantum_core import QuantumCircuit, QuantumGate
+
+
+def dense_cnot(n, control, target):
+    """Full 2^n CNOT, qubit 0 most significant"""
+    dim = 2 ** n
+    m = np.zeros((dim, dim))
+    for i in range(dim):
+        j = i ^ (1 << (n - 1 - target)) if (i >> (n - 1 - control)) & 1 else i
+        m[j, i] = 1
+    return m
+
+
+def random_ops(qc, depth, seed=0):
+    rng = np.random.default_rng(seed)
+    n = qc.num_qubits
+    for _ in range(depth):
+        for q in range(n):
+            getattr(qc, rng.choice(['h', 'x', 'y', 'z']))(q)
+            qc.ry(rng.uniform(0, np.pi), q)
+            qc.rz(rng.uniform(0, np.pi), q)
+        c, t = rng.choice(n, size=2, replace=False)
+        qc.cnot(int(c), int(t))
+    return qc
+
+
+@pytest.mark.parametrize('n', [2, 3, 4])
+def test_run_matches_eager_gates(n):
+    qc = random_ops(QuantumCircuit(n), depth=4, seed=n)
+    eager = qc.get_statevector()
+    assert np.allclose(qc.run().get_statevector(), eager)
+
+
+@pytest.mark.parametrize('control,target', [(0, 1), (1, 0), (0, 2), (2, 1)])
+def test_cnot_matches_dense_msb_matrix(control, target):
+    qc = random_ops(QuantumCircuit(3), depth=1)
+    before = qc.get_statevector()
+    qc.cnot(control, target)
+    assert np.allclose(qc.get_statevector(), dense_cnot(3, control, target) @ before)
+
+
+def test_cnot_qubit_zero_is_most_significant():
+    qc = QuantumCircuit(2).x(0).cnot(0, 1)
+    assert np.allclose(qc.get_statevector(), [0, 0, 0, 1])
+    qc = QuantumCircuit(2).x(1).cnot(0, 1)
+    assert np.allclose(qc.get_statevector(), [0, 1, 0, 0])
+
+
+def test_compile_fuses_single_qubit_runs():
+    qc = QuantumCircuit(2).h(0).rz(0.3, 0).h(1).cnot(0, 1).x(1)
+    plan = qc.compile()
+    assert [step[0] for step in plan] == ['U', 'U', 'CX', 'U']
+    assert np.allclose(plan[0][1], QuantumGate.rotation_z(0.3) @ QuantumGate.hadamard())
+
+
+def test_compiled_plan_cache_is_bounded():
+    for i in range(core._MAX_COMPILED_PLANS + 10):
+        QuantumCircuit(1).rz(float(i), 0).compile()
+    assert len(core._compiled_plans) == core._MAX_COMPILED_PLANS
@@ -0,0 +1,80 @@
+"""Tests for the Bloche engines against dense reference states"""
+
+import numpy as np
+import pytest
+
+from bloche import Bloche, BlocheSoA
+
+
+@pytest.mark.parametrize('shots', [4, 1000])  # searchsorted / multinomial branch
+def test_measure_only_returns_reachable_states(shots):
+    np.random.seed(0)
+    counts = Bloche(2).H(0).CX(0, 1).measure(shots)
+    assert set(counts) <= {'00', '11'}
+    assert sum(counts.values()) == shots
+
+
+@pytest.mark.parametrize('n', [3, 12])  # 2^n below / above the shot count
+def test_measure_follows_probabilities(n):
+    np.random.seed(1)
+    b = Bloche(n)
+    for q in range(n):
+        b.RY(0.3 * (q + 1), q)
+    counts = b.measure(20000)
+    p = np.abs(b.ψ) ** 2
+    top = int(np.argmax(p))
+    assert abs(counts[format(top, f'0{n}b')] / 20000 - p[top]) < 0.02
+
+
+def dense_gate(gate, q, n):
+    """gate on qubit q as a full 2^n matrix, qubit 0 most significant"""
+    m = np.eye(1)
+    for i in range(n):
+        m = np.kron(m, gate if i == q else np.eye(2))
+    return m
+
+
+def random_circuit(b, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(3):
+        for q in range(b.n):
+            b.H(q).RZ(rng.uniform(0, np.pi), q).RY(rng.uniform(0, np.pi), q)
+            b.RX(rng.uniform(0, np.pi), q).Z(q).Y(q)
+        if b.n > 1:
+            c, t = rng.choice(b.n, size=2, replace=False)
+            b.CX(int(c), int(t))
+    return b
+
+
+@pytest.mark.parametrize('q', [0, 1, 2])
+def test_single_qubit_gate_matches_dense_matrix(q):
+    b = random_circuit(Bloche(3))
+    before = b.ψ.copy()
+    b.RX(0.7, q)
+    c, s = np.cos(0.35), np.sin(0.35)
+    rx = np.array([[c, -1j * s], [-1j * s, c]])
+    assert np.allclose(b.ψ, dense_gate(rx, q, 3) @ before)
+
+
+def test_cx_control_is_most_significant():
+    assert Bloche(2).X(0).CX(0, 1).measure(10) == {'11': 10}
+    assert Bloche(2).X(1).CX(0, 1).measure(10) == {'01': 10}
+    assert Bloche(2).X(1).CX(1, 0).measure(10) == {'11': 10}
+
+
+@pytest.mark.parametrize('n', [1, 3, 5])
+def test_soa_matches_complex_storage(n):
+    aos = random_circuit(Bloche(n), seed=n)
+    soa = random_circuit(BlocheSoA(n), seed=n)
+    assert np.allclose(soa.ψ, aos.ψ)
+    np.random.seed(2)
+    a = aos.measure(500)
+    np.random.seed(2)
+    assert soa.measure(500) == a
+
+
+def test_soa_show_matches_complex_storage(capsys):
+    random_circuit(Bloche(3)).show()
+    aos = capsys.readouterr().out
+    random_circuit(BlocheSoA(3)).show()
+    assert capsys.readouterr().out == aos
@@ -0,0 +1,76 @@
+"""Tests for bloche_ultimate's numba kernels against its numpy path"""
+
+import numpy as np
+import pytest
+
+import bloche_ultimate
+from bloche_ultimate import Bloche
+
+
+def random_bloche(n, seed=0):
+    rng = np.random.default_rng(seed)
+    b = Bloche(n)
+    v = rng.normal(size=2 ** n) + 1j * rng.normal(size=2 ** n)
+    b.ψ = v / np.linalg.norm(v)
+    return b
+
+
+def run_circuit(b):
+    for q in range(b.n):
+        b.H(q).RX(0.3, q).RZ(0.7 * (q + 1), q).Y(q)
+    for c, t in [(0, 1), (2, 0), (1, 2), (2, 1)]:
+        b.CX(c, t)
+    return b
+
+
+@pytest.mark.skipif(not bloche_ultimate.HAS_NUMBA, reason='numba not installed')
+@pytest.mark.parametrize('n', [3, 5])
+def test_numba_kernels_match_numpy_path(n, monkeypatch):
+    fast = run_circuit(random_bloche(n)).ψ
+    monkeypatch.setattr(bloche_ultimate, 'HAS_NUMBA', False)
+    slow = run_circuit(random_bloche(n)).ψ
+    assert np.allclose(fast, slow)
+
+
+@pytest.mark.parametrize('path', ['default', 'numpy'])
+def test_cx_control_is_most_significant(path, monkeypatch):
+    if path == 'numpy':
+        monkeypatch.setattr(bloche_ultimate, 'HAS_NUMBA', False)
+    b = Bloche(3).X(0).CX(0, 2)
+    assert np.flatnonzero(b.ψ).tolist() == [0b101]
+    b = Bloche(3).X(2).CX(0, 2)
+    assert np.flatnonzero(b.ψ).tolist() == [0b001]
+
+
+@pytest.mark.parametrize('path', ['default', 'numpy'])
+def test_cx_rejects_equal_control_and_target(path, monkeypatch):
+    if path == 'numpy':
+        monkeypatch.setattr(bloche_ultimate, 'HAS_NUMBA', False)
+    b = random_bloche(3)
+    before = b.ψ.copy()
+    with pytest.raises(ValueError):
+        b.CX(1, 1)
+    assert np.array_equal(b.ψ, before)
+
+
+def reference_uncertainty(ψ):
+    """Δx, Δk from the full FFT with |ψ_k|² normalised to a distribution"""
+    x = np.arange(len(ψ))
+    p = np.abs(ψ) ** 2
+    Δx = np.sqrt(p @ x ** 2 - (p @ x) ** 2)
+    p_k = np.abs(np.fft.fft(ψ)) ** 2
+    p_k /= p_k.sum()
+    k = np.fft.fftfreq(len(ψ))
+    Δk = np.sqrt(p_k @ k ** 2 - (p_k @ k) ** 2)
+    return Δx, Δk
+
+
+@pytest.mark.parametrize('real', [True, False])
+@pytest.mark.parametrize('n', [1, 3, 4])
+def test_heisenberg_uncertainty_matches_full_fft(n, real):
+    b = random_bloche(n, seed=n)
+    if real:
+        b.ψ = np.abs(b.ψ).astype(complex)
+    Δx, Δk, product = b.heisenberg_uncertainty()
+    assert np.allclose((Δx, Δk), reference_uncertainty(b.ψ))
+    assert np.isclose(product, Δx * Δk)
@@ -0,0 +1,54 @@
+"""Tests for HardwareInterface's queued LED writes, with SSH stubbed out"""
+
+import threading
+import time
+
+import pytest
+
+from blackroad_quantum import HardwareInterface
+
+
+@pytest.fixture
+def hw(monkeypatch):
+    """HardwareInterface whose ssh_exec records (device, cmd) after a delay"""
+    hw = HardwareInterface()
+    hw.sent = []
+    lock = threading.Lock()
+
+    def ssh_exec(device, cmd, timeout=10):
+        time.sleep(0.05)
+        with lock:
+            hw.sent.append((device, cmd))
+        return "", True
+
+    monkeypatch.setattr(hw, 'ssh_exec', ssh_exec)
+    return hw
+
+
+def writes(hw, device):
+    return [cmd.split()[1] for d, cmd in hw.sent if d == device]
+
+
+def test_flush_waits_for_queued_writes_in_order(hw):
+    for b in range(3):
+        hw.set_photon('alice', 'ACT', b)
+    hw.set_photon('octavia', 'PWR', 7)
+    hw.flush()
+    assert writes(hw, 'alice') == ['0', '1', '2']
+    assert writes(hw, 'octavia') == ['7']
+
+
+def test_set_photon_many_sends_devices_concurrently(hw):
+    frame = [(d, 'ACT', 255) for d in ('alice', 'octavia', 'lucidia', 'shellfish')]
+    start = time.perf_counter()
+    hw.set_photon_many(frame)
+    elapsed = time.perf_counter() - start
+    assert len(hw.sent) == 4
+    assert elapsed < 3 * 0.05  # one round-trip per frame, not one per device
+
+
+def test_set_photon_many_without_wait_returns_before_sending(hw):
+    hw.set_photon_many([('alice', 'ACT', 1), ('alice', 'PWR', 0)], wait=False)
+    assert len(hw.sent) < 2
+    hw.flush()
+    assert ['/leds/ACT/' in hw.sent[0][1], '/leds/PWR/' in hw.sent[1][1]] == [True, True]